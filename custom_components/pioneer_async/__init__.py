@@ -8,7 +8,6 @@ import logging
 import traceback
 from typing import Any
 
-from aiopioneer import PioneerAVR
 from aiopioneer.const import Zone
 from aiopioneer.params import PARAM_ZONE_SOURCES
 from aiopioneer.exceptions import AVRConnectError
@@ -24,8 +23,11 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.typing import UNDEFINED
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import UNDEFINED, ConfigType
+from homeassistant.util import dt as dt_util
 
 from .config_flow import (
     PioneerAVRConfigFlow,
@@ -39,16 +41,52 @@ from .const import (
     MIGRATE_CONFIG,
     CONF_SOURCES,
     CONF_PARAMS,
+    CONF_ADAPTIVE_COMMAND_DELAY,
+    CONF_COMMAND_DELAY_MIN,
+    CONF_COMMAND_DELAY_MAX,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_HOTPATH_TIMING,
+    CONF_SLOW_CALLBACK_THRESHOLD,
     CONFIG_DEFAULTS,
+    SNAPSHOT_STORAGE_VERSION,
+    QUERY_BATCH_WINDOW,
     PioneerData,
 )
+from .avr import PioneerHassAVR
+from .capture import PioneerTrafficCapture
 from .coordinator import PioneerAVRZoneCoordinator
+from .pacing import PioneerCommandPacer
+from .profiler import async_setup_services
+from .query import PioneerQueryBatcher
+from .refresh import PioneerRefreshManager, async_get_refresh_planner
+from .timing import (
+    PHASE_MIGRATE,
+    PHASE_SETUP,
+    PHASE_PLATFORMS,
+    PioneerHotPathTimer,
+    async_get_setup_timer,
+    async_pop_setup_timer,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Pioneer AVR integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Migrate Pioneer AVR config entry."""
+    with async_get_setup_timer(hass, config_entry.entry_id).phase(PHASE_MIGRATE):
+        return await _async_migrate_entry(hass, config_entry)
+
+
+async def _async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
+    """Migrate Pioneer AVR config entry data and options."""
     _LOGGER.debug(
         "migrating config from version %d.%d to current version %d.%d",
         config_entry.version,
@@ -141,36 +179,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = pioneer_data = PioneerData()
     name = entry.title
+    timer = pioneer_data.setup_timer = async_pop_setup_timer(hass, entry.entry_id)
+    timer.start_setup()
 
     ## Compile config and params
-    config = pioneer_data.options = CONFIG_DEFAULTS | get_entry_config(entry)
-    params = get_config_params(config) | config.get(CONF_PARAMS, {})
+    with timer.phase(PHASE_SETUP, "config"):
+        config = pioneer_data.options = CONFIG_DEFAULTS | get_entry_config(entry)
+        params = get_config_params(config) | config.get(CONF_PARAMS, {})
 
     _LOGGER.debug(
         ">> async_setup_entry(entry_id=%s, config=%s)", entry.entry_id, config
     )
 
+    ## Capture AVR traffic if enabled
+    traffic_capture = None
+    if config[CONF_CAPTURE_TRAFFIC]:
+        timestamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        traffic_capture = PioneerTrafficCapture(
+            hass, hass.config.path(f"{DOMAIN}_{entry.entry_id}_{timestamp}.capture")
+        )
+        await traffic_capture.async_start()
+    pioneer_data.traffic_capture = traffic_capture
+
     ## Create PioneerAVR API object
     pioneer = None
     try:
-        pioneer = PioneerAVR(
-            host=config[CONF_HOST],
-            port=config[CONF_PORT],
-            timeout=config[CONF_TIMEOUT],
-            scan_interval=config[CONF_SCAN_INTERVAL],
-            params=params,
-        )
-        await pioneer.connect()
-        await pioneer.query_zones()
+        with timer.phase(PHASE_SETUP, "pioneer_avr"):
+            pioneer = PioneerHassAVR(
+                host=config[CONF_HOST],
+                port=config[CONF_PORT],
+                timeout=config[CONF_TIMEOUT],
+                scan_interval=config[CONF_SCAN_INTERVAL],
+                params=params,
+            )
+        pioneer.traffic_capture = traffic_capture
+        with timer.phase(PHASE_SETUP, "connect"):
+            await pioneer.connect()
+        with timer.phase(PHASE_SETUP, "query_zones"):
+            await pioneer.query_zones()
         if not Zone.Z1 in pioneer.properties.zones:
             raise RuntimeError(f"{Zone.Z1.full_name} not discovered on AVR")
         if config[CONF_SOURCES]:
             pioneer.properties.set_source_dict(config[CONF_SOURCES])
         else:
-            await pioneer.build_source_dict()
+            with timer.phase(PHASE_SETUP, "build_source_dict"):
+                await pioneer.build_source_dict()
     except AVRConnectError as exc:
         _LOGGER.error("unable to connect to AVR: %s", exc.err)
         del pioneer
+        if traffic_capture:
+            await traffic_capture.async_stop()
         raise ConfigEntryNotReady from exc
     except Exception as exc:  # pylint: disable=broad-except
         _LOGGER.error("exception initialising Pioneer AVR: %s", repr(exc))
@@ -178,9 +236,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if pioneer:
             await pioneer.shutdown()
             del pioneer
+        if traffic_capture:
+            await traffic_capture.async_stop()
         raise ConfigEntryNotReady from exc
 
     pioneer_data.pioneer = pioneer
+    pioneer_data.query_batcher = PioneerQueryBatcher(pioneer, QUERY_BATCH_WINDOW)
+    if config[CONF_ADAPTIVE_COMMAND_DELAY]:
+        pioneer.command_pacer = PioneerCommandPacer(
+            pioneer.params,
+            delay_min=config[CONF_COMMAND_DELAY_MIN],
+            delay_max=config[CONF_COMMAND_DELAY_MAX],
+        )
+    if config[CONF_HOTPATH_TIMING]:
+        pioneer_data.hotpath_timer = PioneerHotPathTimer(
+            config[CONF_SLOW_CALLBACK_THRESHOLD] / 1000
+        )
+
+    ## Load persisted zone snapshots
+    pioneer_data.snapshot_store = get_snapshot_store(hass, entry)
+    with timer.phase(PHASE_SETUP, "snapshots"):
+        pioneer_data.snapshots = await pioneer_data.snapshot_store.async_load() or {}
 
     ## Set up parent device for Pioneer AVR
     model = pioneer.properties.amp.get("model")
@@ -195,43 +271,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     def get_zone_identifiers(zone: str) -> set[tuple[str, str]]:
         return {(DOMAIN, i + "-" + zone) for _, i in top_identifiers}
 
-    ## Update devices with new device_unique_ids (config entry and MAC address)
-    ## TODO: remove legacy device_unique_ids from device entries in 0.10.0 or later
-    ## NOTE: legacy connections with "unknown" MAC address can't be removed
-    legacy_unique_id = f"{config[CONF_HOST]}:{config[CONF_PORT]}"
-
-    dr = device_registry.async_get(hass)
-    for device_entry in device_registry.async_entries_for_config_entry(
-        dr, entry.entry_id
-    ):
-        id_list = [(legacy_unique_id, top_identifiers)]
-        id_list += [
-            (legacy_unique_id + "-" + z, get_zone_identifiers(z))
-            for z in pioneer.properties.zones
-        ]
-        for legacy_id, new_ids in id_list:
-            if (DOMAIN, legacy_id) in device_entry.identifiers and (
-                device_entry.identifiers | new_ids != device_entry.identifiers
-            ):
-                _LOGGER.warning(
-                    "updating device ID for legacy device %s (%s)",
-                    device_entry.name,
-                    legacy_id,
-                )
-                dr.async_update_device(device_entry.id, merge_identifiers=new_ids)
-                break
-
-    ## Create top level devices
-    device_entry = dr.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        connections=connections,
-        identifiers=top_identifiers,
-        manufacturer="Pioneer",
-        name=name,
-        model=model,
-        sw_version=software_version or UNDEFINED,
-        configuration_url=f"http://{config[CONF_HOST]}",
-    )
+    with timer.phase(PHASE_SETUP, "device_registry"):
+        ## Update devices with new device_unique_ids (config entry and MAC address)
+        ## TODO: remove legacy device_unique_ids from device entries in 0.10.0 or later
+        ## NOTE: legacy connections with "unknown" MAC address can't be removed
+        legacy_unique_id = f"{config[CONF_HOST]}:{config[CONF_PORT]}"
+
+        dr = device_registry.async_get(hass)
+        for device_entry in device_registry.async_entries_for_config_entry(
+            dr, entry.entry_id
+        ):
+            id_list = [(legacy_unique_id, top_identifiers)]
+            id_list += [
+                (legacy_unique_id + "-" + z, get_zone_identifiers(z))
+                for z in pioneer.properties.zones
+            ]
+            for legacy_id, new_ids in id_list:
+                if (DOMAIN, legacy_id) in device_entry.identifiers and (
+                    device_entry.identifiers | new_ids != device_entry.identifiers
+                ):
+                    _LOGGER.warning(
+                        "updating device ID for legacy device %s (%s)",
+                        device_entry.name,
+                        legacy_id,
+                    )
+                    dr.async_update_device(device_entry.id, merge_identifiers=new_ids)
+                    break
+
+        ## Create top level devices
+        device_entry = dr.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            connections=connections,
+            identifiers=top_identifiers,
+            manufacturer="Pioneer",
+            name=name,
+            model=model,
+            sw_version=software_version or UNDEFINED,
+            configuration_url=f"http://{config[CONF_HOST]}",
+        )
 
     pioneer_data.zone_device_info[Zone.ALL] = DeviceInfo(identifiers=top_identifiers)
     pioneer_data.device_entries[Zone.ALL] = device_entry
@@ -245,8 +322,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             sw_version=pioneer.properties.amp.get("software_version") or UNDEFINED,
         )
 
-    coordinator = PioneerAVRZoneCoordinator(hass, pioneer, Zone.ALL)
-    await coordinator.async_config_entry_first_refresh()
+    if pioneer_data.hotpath_timer is not None:
+        update_top_device = pioneer_data.hotpath_timer.wrap(
+            update_top_device, "update_top_device"
+        )
+
+    coordinator = PioneerAVRZoneCoordinator(
+        hass, pioneer, Zone.ALL, hotpath_timer=pioneer_data.hotpath_timer
+    )
+    with timer.phase(PHASE_SETUP, "coordinator_first_refresh"):
+        await coordinator.async_config_entry_first_refresh()
     coordinator.set_zone_callback()
     pioneer_data.coordinators[Zone.ALL] = coordinator
 
@@ -259,14 +344,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             model=zone.full_name,
             via_device=(DOMAIN, entry.entry_id),
         )
-        coordinator = PioneerAVRZoneCoordinator(hass, pioneer, zone)
+        coordinator = PioneerAVRZoneCoordinator(
+            hass, pioneer, zone, hotpath_timer=pioneer_data.hotpath_timer
+        )
         coordinator.set_zone_callback()
         if zone is Zone.Z1:
             coordinator.set_initial_refresh_callback(update_top_device)
         pioneer_data.coordinators[zone] = coordinator
 
+    ## Create refresh manager, which tracks property groups used by entities
+    refresh_manager = PioneerRefreshManager(hass, pioneer_data)
+    pioneer_data.refresh_manager = refresh_manager
+
     ## Set up platforms for Pioneer AVR
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with timer.phase(PHASE_SETUP, PHASE_PLATFORMS):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    ## Start refresh manager
+    refresh_manager.start()
+    entry.async_on_unload(refresh_manager.stop)
+
+    ## Stagger full refreshes with other Pioneer AVR config entries
+    entry.async_on_unload(
+        async_get_refresh_planner(hass).register(entry.entry_id, refresh_manager)
+    )
 
     async def _update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
         """Handle options update."""
@@ -283,6 +384,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _shutdown_listener)
     )
 
+    timer.finish_setup()
     return True
 
 
@@ -291,23 +393,51 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug(">> async_unload_entry()")
 
     ## Clear callback references from Pioneer AVR (to allow entities to unload)
-    pioneer: PioneerAVR = hass.data[DOMAIN][entry.entry_id].pioneer
+    pioneer_data: PioneerData = hass.data[DOMAIN][entry.entry_id]
+    pioneer = pioneer_data.pioneer
     pioneer.clear_zone_callbacks()
 
+    ## Cancel volume ramps in progress
+    for task in pioneer_data.volume_ramps.values():
+        task.cancel()
+    pioneer_data.volume_ramps.clear()
+    await pioneer_data.query_batcher.shutdown()
+
     ## Unload platforms for Pioneer AVR
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     ## Shutdown Pioneer AVR for removal
     await pioneer.shutdown()
+    if pioneer_data.traffic_capture:
+        await pioneer_data.traffic_capture.async_stop()
+    if pioneer_data.hotpath_timer:
+        _LOGGER.debug("hot path timing: %s", pioneer_data.hotpath_timer.as_dict())
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+
+        ## Release coordinators and the closures they hold (eg. update_top_device)
+        for coordinator in pioneer_data.coordinators.values():
+            coordinator.set_initial_refresh_callback(None)
+            coordinator.set_power_on_callback(None)
+            await coordinator.async_shutdown()
+        pioneer_data.coordinators.clear()
     else:
         _LOGGER.warning("unload_entry unload failed")
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data for a config entry."""
+    await get_snapshot_store(hass, entry).async_remove()
+
+
+def get_snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return zone snapshot store for config entry."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshots")
+
+
 def select_dict(orig_dict: dict[str, Any], include_keys: list[str]) -> dict[str, Any]:
     """Include only specified keys from dict."""
     return {k: v for k, v in orig_dict.items() if k in include_keys}
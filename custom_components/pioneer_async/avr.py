@@ -0,0 +1,122 @@
+"""Pioneer AVR API with integration extensions."""
+
+import time
+
+from aiopioneer import PioneerAVR
+from aiopioneer.const import Zone
+from aiopioneer.exceptions import AVRCommandResponseError, AVRResponseTimeoutError
+from aiopioneer.property_registry import PROPERTY_REGISTRY
+
+from .capture import PioneerTrafficCapture
+from .capture_format import CAPTURE_SENT, CAPTURE_RECEIVED
+from .latency import PioneerCommandStats
+from .pacing import PioneerCommandPacer
+
+AVR_BUSY_RESPONSES = ["E02", "B00"]
+CHANNEL_LEVEL_QUERY = "query_channel_level"
+
+
+def _get_response_queries() -> dict[str, tuple[str, Zone]]:
+    """Return the query command and zone refreshed by each AVR response prefix."""
+    response_queries = {}
+    for response_cmd, code_map, zone in PROPERTY_REGISTRY.responses:
+        property_entry = PROPERTY_REGISTRY.code_map_index.get(code_map)
+        if property_entry is None or property_entry.query_command is None:
+            continue
+        if zone is Zone.ALL:
+            zone = Zone.Z1  ## global properties are queried via Zone 1
+        response_queries[response_cmd] = (property_entry.query_command.name, zone)
+    return response_queries
+
+
+## Response prefixes do not overlap, so looking up the prefix of each length
+## matches the same entry as a PROPERTY_REGISTRY.match_response() linear scan
+RESPONSE_QUERIES = _get_response_queries()
+RESPONSE_PREFIX_LENGTHS = sorted({len(r) for r in RESPONSE_QUERIES}, reverse=True)
+
+
+class PioneerHassAVR(PioneerAVR):
+    """Pioneer AVR API that tracks property updates and command latency."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the Pioneer AVR API."""
+        super().__init__(*args, **kwargs)
+        self.query_updated: dict[tuple[str, Zone, tuple], float] = {}
+        self.command_pacer: PioneerCommandPacer | None = None
+        self.command_stats = PioneerCommandStats()
+        self.traffic_capture: PioneerTrafficCapture | None = None
+
+    def decode_response(self, response_raw: str) -> None:
+        """Record the time the AVR property was updated, then decode response.
+
+        The update time is recorded first so that it is current when the zone
+        callbacks are called by the decode.
+        """
+        if self.traffic_capture is not None:
+            self.traffic_capture.record(CAPTURE_RECEIVED, response_raw)
+        self._record_query_updated(response_raw)
+        super().decode_response(response_raw)
+
+    def _record_query_updated(self, response_raw: str) -> None:
+        """Record the time the AVR properties for a query were updated."""
+        for prefix_len in RESPONSE_PREFIX_LENGTHS:
+            if (query := RESPONSE_QUERIES.get(response_raw[:prefix_len])) is not None:
+                break
+        else:
+            return
+        query_command, zone = query
+        updated = time.monotonic()
+        if query_command != CHANNEL_LEVEL_QUERY:
+            self.query_updated[(query_command, zone, ())] = updated
+            return
+
+        ## Channel levels are queried per channel
+        channel = response_raw[prefix_len : prefix_len + 3].rstrip("_")
+        channels = [channel]
+        if channel == "ALL":
+            channels = self.properties.channel_level.get(zone, {})
+        for channel in channels:
+            self.query_updated[(query_command, zone, (channel,))] = updated
+
+    def get_query_age(self, query_command: str, zone: Zone, *args) -> float | None:
+        """Return seconds since the AVR properties for a query were last updated."""
+        if (updated := self.query_updated.get((query_command, zone, args))) is None:
+            return None
+        return time.monotonic() - updated
+
+    async def send_command(self, command: str, *args, **kwargs) -> str | bool | None:
+        """Send a command or request to the AVR and record its latency."""
+        token = self.command_stats.start(command)
+        try:
+            return await super().send_command(command, *args, **kwargs)
+        finally:
+            self.command_stats.finish(token)
+
+    async def send_raw_command(self, command: str, rate_limit: bool = True) -> None:
+        """Send a raw command to the AVR and capture it if enabled."""
+        await super().send_raw_command(command, rate_limit=rate_limit)
+        self.command_stats.record_sent()
+        if self.traffic_capture is not None:
+            self.traffic_capture.record(CAPTURE_SENT, command)
+
+    async def send_raw_request(self, command: str, *args, **kwargs) -> str:
+        """Send a raw request and report the AVR response to the command pacer."""
+        command_pacer = self.command_pacer
+        try:
+            response = await super().send_raw_request(command, *args, **kwargs)
+        except AVRResponseTimeoutError:
+            self.command_stats.record_error(timeout=True)
+            if command_pacer is not None:
+                command_pacer.record_error(timeout=True)
+            raise
+        except AVRCommandResponseError as exc:
+            busy = exc.response in AVR_BUSY_RESPONSES
+            self.command_stats.record_error(busy=busy)
+            if command_pacer is not None and busy:
+                command_pacer.record_error()
+            raise
+        self.command_stats.record_response()
+        if command_pacer is not None:
+            ## Latency is measured from when the (last) command was sent
+            command_pacer.record_response(time.time() - self._last_command_at)
+        return response
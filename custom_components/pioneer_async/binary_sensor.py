@@ -17,11 +17,13 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import select_dict, reject_dict
 from .const import DOMAIN, PioneerData
 from .entity_base import PioneerEntityBase
+from .timing import timed_platform_setup
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@timed_platform_setup("binary_sensor")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
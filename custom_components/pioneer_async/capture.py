@@ -0,0 +1,84 @@
+"""Pioneer AVR traffic capture."""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import TextIO
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .capture_format import format_capture_header, format_capture_line
+from .const import CAPTURE_FLUSH_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PioneerTrafficCapture:
+    """Record timestamped raw AVR traffic to a capture file.
+
+    Each line of the capture file contains the seconds since the capture
+    started, the direction (> sent to AVR, < received from AVR) and the raw
+    command or response. Lines are buffered and written in the executor, and
+    writes are serialised with closing the file.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the Pioneer AVR traffic capture."""
+        self.hass = hass
+        self.path = path
+        self._start = time.monotonic()
+        self._buffer: list[str] = [format_capture_header(dt_util.utcnow().isoformat())]
+        self._file: TextIO | None = None
+        self._lock = asyncio.Lock()
+        self._cancel_flush: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> None:
+        """Open the capture file and start flushing captured traffic."""
+        self._file = await self.hass.async_add_executor_job(
+            open, self.path, "w", -1, "utf-8"
+        )
+        self._cancel_flush = async_track_time_interval(
+            self.hass,
+            self._async_flush,
+            timedelta(seconds=CAPTURE_FLUSH_INTERVAL),
+            name="pioneer_async_capture_flush",
+        )
+        _LOGGER.info("capturing AVR traffic to %s", self.path)
+
+    async def async_stop(self) -> None:
+        """Write remaining captured traffic and close the capture file."""
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        async with self._lock:
+            if self._file is None:
+                return
+            await self._async_write_buffer()
+            await self.hass.async_add_executor_job(self._file.close)
+            self._file = None
+
+    @callback
+    def record(self, direction: str, message: str) -> None:
+        """Record a raw command sent to or response received from the AVR."""
+        elapsed = time.monotonic() - self._start
+        self._buffer.append(format_capture_line(elapsed, direction, message))
+
+    async def _async_flush(self, _now=None) -> None:
+        """Write captured traffic to the capture file."""
+        async with self._lock:
+            if self._file is not None:
+                await self._async_write_buffer()
+
+    async def _async_write_buffer(self) -> None:
+        """Write buffered lines to the open capture file."""
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        await self.hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        self._file.writelines(lines)
+        self._file.flush()
@@ -0,0 +1,37 @@
+"""Pioneer AVR traffic capture file format.
+
+This module does not import Home Assistant, so that it can be used by tools
+that read capture files without Home Assistant installed.
+"""
+
+from typing import NamedTuple
+
+CAPTURE_FORMAT_HEADER = "# pioneer_async capture v1"
+CAPTURE_SENT = ">"  ## sent to AVR
+CAPTURE_RECEIVED = "<"  ## received from AVR
+
+
+class CaptureMessage(NamedTuple):
+    """Captured AVR command or response."""
+
+    elapsed: float  ## seconds since start of capture
+    direction: str
+    message: str
+
+
+def format_capture_header(started: str) -> str:
+    """Return the capture file header line for a capture start time."""
+    return f"{CAPTURE_FORMAT_HEADER} {started}\n"
+
+
+def format_capture_line(elapsed: float, direction: str, message: str) -> str:
+    """Return a capture file line for a command or response."""
+    return f"{elapsed:.3f} {direction} {message}\n"
+
+
+def parse_capture_line(line: str) -> CaptureMessage | None:
+    """Return the message of a capture file line, or None for comments."""
+    if line.startswith("#") or not line.strip():
+        return None
+    elapsed, direction, message = line.rstrip("\n").split(" ", 2)
+    return CaptureMessage(float(elapsed), direction, message)
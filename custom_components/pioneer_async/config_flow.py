@@ -61,6 +61,21 @@ from .const import (
     CONF_IGNORE_ZONE_3,
     CONF_IGNORE_HDZONE,
     CONF_QUERY_SOURCES,
+    CONF_VOLUME_STEP_BURST,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL_IDLE,
+    CONF_SCAN_INTERVAL_ACTIVE,
+    CONF_SELECTIVE_REFRESH,
+    CONF_REFRESH_SCHEDULER,
+    CONF_REFRESH_STALE_ONLY,
+    CONF_HEARTBEAT,
+    CONF_HEARTBEAT_REFRESH_COUNT,
+    CONF_ADAPTIVE_COMMAND_DELAY,
+    CONF_COMMAND_DELAY_MIN,
+    CONF_COMMAND_DELAY_MAX,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_HOTPATH_TIMING,
+    CONF_SLOW_CALLBACK_THRESHOLD,
     DEFAULT_NAME,
     DEFAULT_HOST,
     DEFAULT_PORT,
@@ -753,6 +768,15 @@ class PioneerOptionsFlow(config_entries.OptionsFlow):
                 vol.Optional(
                     PARAM_DISABLE_AUTO_QUERY, default=defaults[PARAM_DISABLE_AUTO_QUERY]
                 ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_SELECTIVE_REFRESH, default=defaults[CONF_SELECTIVE_REFRESH]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_REFRESH_SCHEDULER, default=defaults[CONF_REFRESH_SCHEDULER]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_REFRESH_STALE_ONLY, default=defaults[CONF_REFRESH_STALE_ONLY]
+                ): selector.BooleanSelector(),
                 vol.Optional(
                     PARAM_POWER_ON_VOLUME_BOUNCE,
                     default=defaults[PARAM_POWER_ON_VOLUME_BOUNCE],
@@ -764,9 +788,94 @@ class PioneerOptionsFlow(config_entries.OptionsFlow):
                 vol.Optional(
                     PARAM_VOLUME_STEP_ONLY, default=defaults[PARAM_VOLUME_STEP_ONLY]
                 ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_VOLUME_STEP_BURST, default=defaults[CONF_VOLUME_STEP_BURST]
+                ): vol.All(
+                    selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=50,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Coerce(int),
+                ),
                 vol.Optional(
                     PARAM_ALWAYS_POLL, default=defaults[PARAM_ALWAYS_POLL]
                 ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_ADAPTIVE_SCAN_INTERVAL,
+                    default=defaults[CONF_ADAPTIVE_SCAN_INTERVAL],
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_IDLE, default=defaults[CONF_SCAN_INTERVAL_IDLE]
+                ): vol.All(
+                    selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=2592000,  # 30 days
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Coerce(int),
+                ),
+                vol.Optional(
+                    CONF_SCAN_INTERVAL_ACTIVE,
+                    default=defaults[CONF_SCAN_INTERVAL_ACTIVE],
+                ): vol.All(
+                    selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=2592000,  # 30 days
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Coerce(int),
+                ),
+                vol.Optional(
+                    CONF_HEARTBEAT, default=defaults[CONF_HEARTBEAT]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_HEARTBEAT_REFRESH_COUNT,
+                    default=defaults[CONF_HEARTBEAT_REFRESH_COUNT],
+                ): vol.All(
+                    selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=1000,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Coerce(int),
+                ),
+                vol.Optional(
+                    CONF_ADAPTIVE_COMMAND_DELAY,
+                    default=defaults[CONF_ADAPTIVE_COMMAND_DELAY],
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_COMMAND_DELAY_MIN, default=defaults[CONF_COMMAND_DELAY_MIN]
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0.0,
+                        max=1.0,
+                        step=0.01,
+                        unit_of_measurement="s",
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
+                vol.Optional(
+                    CONF_COMMAND_DELAY_MAX, default=defaults[CONF_COMMAND_DELAY_MAX]
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0.0,
+                        max=5.0,
+                        step=0.01,
+                        unit_of_measurement="s",
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
                 vol.Optional(
                     PARAM_MAX_VOLUME, default=defaults[PARAM_MAX_VOLUME]
                 ): vol.All(
@@ -832,6 +941,26 @@ class PioneerOptionsFlow(config_entries.OptionsFlow):
                     PARAM_DEBUG_COMMAND_QUEUE,
                     default=defaults[PARAM_DEBUG_COMMAND_QUEUE],
                 ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_CAPTURE_TRAFFIC, default=defaults[CONF_CAPTURE_TRAFFIC]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_HOTPATH_TIMING, default=defaults[CONF_HOTPATH_TIMING]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_SLOW_CALLBACK_THRESHOLD,
+                    default=defaults[CONF_SLOW_CALLBACK_THRESHOLD],
+                ): vol.All(
+                    selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=10000,
+                            unit_of_measurement="ms",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Coerce(int),
+                ),
             }
         )
         return self.async_show_form(
@@ -1,7 +1,8 @@
 """Constants for the pioneer_async integration."""
 
+import asyncio
 from datetime import timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from aiopioneer import PioneerAVR
 from aiopioneer.const import Zone
@@ -23,8 +24,16 @@ from homeassistant.const import (
 )
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .query import PioneerQueryBatcher
+
+if TYPE_CHECKING:
+    from .capture import PioneerTrafficCapture
+    from .refresh import PioneerRefreshManager
+    from .timing import PioneerHotPathTimer, PioneerSetupTimer
+
 DOMAIN = "pioneer_async"
 PLATFORMS = [
     Platform.MEDIA_PLAYER,
@@ -46,6 +55,13 @@ DEFAULT_SCAN_INTERVAL = timedelta(seconds=60)
 DEFAULT_TIMEOUT = 5
 DEFAULT_SOURCES = {}
 DEFAULT_ENABLED_CHANNELS = ["L", "C", "R", "SL", "SR", "SBL", "SBR"]
+DEFAULT_VOLUME_STEP_BURST = 10
+DEFAULT_SCAN_INTERVAL_IDLE = 300
+DEFAULT_SCAN_INTERVAL_ACTIVE = 10
+DEFAULT_HEARTBEAT_REFRESH_COUNT = 20
+DEFAULT_COMMAND_DELAY_MIN = 0.1  ## aiopioneer default command delay
+DEFAULT_COMMAND_DELAY_MAX = 1.0
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 50  ## ms
 
 CONF_SOURCES = "sources"
 CONF_PARAMS = "params"
@@ -53,6 +69,21 @@ CONF_IGNORE_ZONE_2 = "ignore_zone_2"  ## UI option only
 CONF_IGNORE_ZONE_3 = "ignore_zone_3"  ## UI option only
 CONF_IGNORE_HDZONE = "ignore_hdzone"  ## UI option only
 CONF_QUERY_SOURCES = "query_sources"  ## UI option only, inferred from CONF_SOURCES
+CONF_VOLUME_STEP_BURST = "volume_step_burst"
+CONF_ADAPTIVE_SCAN_INTERVAL = "adaptive_scan_interval"
+CONF_SCAN_INTERVAL_IDLE = "scan_interval_idle"
+CONF_SCAN_INTERVAL_ACTIVE = "scan_interval_active"
+CONF_SELECTIVE_REFRESH = "selective_refresh"
+CONF_REFRESH_SCHEDULER = "refresh_scheduler"
+CONF_REFRESH_STALE_ONLY = "refresh_stale_only"
+CONF_HEARTBEAT = "heartbeat"
+CONF_HEARTBEAT_REFRESH_COUNT = "heartbeat_refresh_count"
+CONF_ADAPTIVE_COMMAND_DELAY = "adaptive_command_delay"
+CONF_COMMAND_DELAY_MIN = "command_delay_min"
+CONF_COMMAND_DELAY_MAX = "command_delay_max"
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+CONF_HOTPATH_TIMING = "hotpath_timing"
+CONF_SLOW_CALLBACK_THRESHOLD = "slow_callback_threshold"
 
 ## Deprecated options
 # CONF_NAME  ## deprecated
@@ -98,6 +129,21 @@ OPTIONS_DEFAULTS = {
     CONF_IGNORE_ZONE_2: False,
     CONF_IGNORE_ZONE_3: False,
     CONF_IGNORE_HDZONE: False,
+    CONF_VOLUME_STEP_BURST: DEFAULT_VOLUME_STEP_BURST,
+    CONF_ADAPTIVE_SCAN_INTERVAL: False,
+    CONF_SCAN_INTERVAL_IDLE: DEFAULT_SCAN_INTERVAL_IDLE,
+    CONF_SCAN_INTERVAL_ACTIVE: DEFAULT_SCAN_INTERVAL_ACTIVE,
+    CONF_SELECTIVE_REFRESH: False,
+    CONF_REFRESH_SCHEDULER: False,
+    CONF_REFRESH_STALE_ONLY: False,
+    CONF_HEARTBEAT: False,
+    CONF_HEARTBEAT_REFRESH_COUNT: DEFAULT_HEARTBEAT_REFRESH_COUNT,
+    CONF_ADAPTIVE_COMMAND_DELAY: False,
+    CONF_COMMAND_DELAY_MIN: DEFAULT_COMMAND_DELAY_MIN,
+    CONF_COMMAND_DELAY_MAX: DEFAULT_COMMAND_DELAY_MAX,
+    CONF_CAPTURE_TRAFFIC: False,
+    CONF_HOTPATH_TIMING: False,
+    CONF_SLOW_CALLBACK_THRESHOLD: DEFAULT_SLOW_CALLBACK_THRESHOLD,
     ## NOTE: CONF_QUERY_SOURCES is not retained in config entry
 }
 OPTIONS_ALL = OPTIONS_DEFAULTS.keys()
@@ -119,8 +165,96 @@ SERVICE_SEND_COMMAND = "send_command"
 SERVICE_SET_AMP_SETTINGS = "set_amp_settings"
 SERVICE_SET_VIDEO_SETTINGS = "set_video_settings"
 SERVICE_SET_DSP_SETTINGS = "set_dsp_settings"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+SERVICE_VOLUME_RAMP = "volume_ramp"
+SERVICE_GET_PROPERTIES = "get_properties"
+SERVICE_PROFILE = "profile"
+
+QUERY_BATCH_WINDOW = 0.05  ## seconds to collect entity update queries
+VOLUME_STEP_POLL_INTERVAL = 0.05  ## seconds between checks for volume step responses
+ADAPTIVE_ACTIVE_PERIOD = 120  ## seconds to use active scan interval after activity
+REFRESH_GROUPS_ALWAYS = ["basic"]  ## property groups refreshed without entities
+REFRESH_SCHEDULER_INTERVAL = 5  ## seconds between refresh schedule checks
+COMMAND_PACING_DECREASE = 0.01  ## seconds command delay decreased per response
+COMMAND_PACING_INCREASE_FACTOR = 2  ## command delay multiplier on AVR congestion
+COMMAND_PACING_INCREASE_MIN = 0.05  ## minimum seconds command delay increased
+COMMAND_PACING_SLOW_FACTOR = 3  ## response latency multiple considered slow
+COMMAND_PACING_SLOW_MIN = 0.5  ## minimum seconds response latency considered slow
+COMMAND_PACING_LATENCY_WEIGHT = 0.2  ## weight of new latency in smoothed latency
+COMMAND_PACING_APPLY_DECREASE = 0.05  ## minimum seconds decrease applied to AVR
+CAPTURE_FLUSH_INTERVAL = 5  ## seconds between writes to AVR traffic capture file
+HOTPATH_TIMING_WINDOW = 1000  ## durations kept for hot path percentiles
+## Command latency histogram bucket upper bounds (ms)
+COMMAND_LATENCY_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+COMMAND_LATENCY_PERCENTILES = [50, 95, 99]  ## exposed as diagnostic sensors
+
+REFRESH_CONDITION_ZONE_ON = "zone_on"
+REFRESH_CONDITION_SOURCE_TUNER = "source_tuner"
+REFRESH_SCHEDULE = {  ## property group: (refresh interval in seconds, condition)
+    "basic": (60, REFRESH_CONDITION_ZONE_ON),
+    "amp": (300, REFRESH_CONDITION_ZONE_ON),
+    "dsp": (300, REFRESH_CONDITION_ZONE_ON),
+    "tone": (300, REFRESH_CONDITION_ZONE_ON),
+    "channel": (600, REFRESH_CONDITION_ZONE_ON),
+    "video": (120, REFRESH_CONDITION_ZONE_ON),
+    "tuner": (60, REFRESH_CONDITION_SOURCE_TUNER),
+    "display": (60, REFRESH_CONDITION_ZONE_ON),
+    "system": (3600, REFRESH_CONDITION_ZONE_ON),
+}
+REFRESH_DEPENDENCIES = {  ## trigger property: dependent property groups or queries
+    "source_id": ["basic", "listening_mode"],
+    "listening_mode": ["basic_audio_information"],
+    "dsp.mcacc_memory_set": ["channel"],
+    "tone.status": ["tone_bass", "tone_treble"],
+}
+REFRESH_DEPENDENCY_GLOBAL_TRIGGERS = ["listening_mode", "dsp.mcacc_memory_set"]
+ZONE_HYDRATION_TIERS = [  ## property groups or queries on zone power on, in order
+    ["volume", "mute", "source"],
+    ["listening_mode", "tone", "channel"],
+    ["basic", "video"],
+]
+ZONE_HYDRATION_DELAY = 2.5  ## AVR returns E02 to queries immediately after power on
+
+DEFAULT_VOLUME_RAMP_DURATION = 5
+VOLUME_RAMP_CURVES = ["linear", "ease_in", "ease_out", "ease_in_out"]
+DEFAULT_PROPERTY_MAX_AGE = 30
+DEFAULT_PROFILE_DURATION = 10
+DEFAULT_PROFILE_TOP = 20
+PROFILE_SORT_KEYS = ["cumulative", "tottime", "calls"]
+
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_DEFAULT_NAME = "default"
+SNAPSHOT_SETTINGS = {  ## settings captured by snapshot, in restore order
+    "tone": ["status", "bass", "treble"],
+    "dsp": [
+        "mcacc_memory_set",
+        "phase_control",
+        "phase_control_plus",
+        "virtual_speakers",
+        "sound_retriever",
+        "signal_select",
+        "eq",
+        "standing_wave",
+        "sound_delay",
+        "dialog_enhancement",
+        "dynamic_range",
+        "lfe_attenuator",
+        "loudness_management",
+    ],
+    "video": [
+        "resolution",
+        "converter",
+        "pure_cinema",
+        "aspect",
+        "super_resolution",
+    ],
+}
 
 ## hass.data attributes
+DATA_REFRESH_PLANNER = f"{DOMAIN}_refresh_planner"
+DATA_SETUP_TIMERS = f"{DOMAIN}_setup_timers"
+DATA_PROFILER = f"{DOMAIN}_profiler"
 ATTR_PIONEER = "pioneer"
 ATTR_COORDINATORS = "coordinators"
 ATTR_DEVICE_INFO = "device_info"
@@ -131,11 +265,21 @@ ATTR_OPTIONS = "options"
 class PioneerData:
     """Pioneer data object."""
 
-    pioneer: PioneerAVR = None
-    options: dict[str, Any] = {}
-    coordinators: dict[Zone, DataUpdateCoordinator] = {}
-    zone_device_info: dict[Zone, DeviceInfo] = {}
-    device_entries: dict[Zone, DeviceEntry] = {}
+    def __init__(self) -> None:
+        self.pioneer: PioneerAVR = None
+        self.options: dict[str, Any] = {}
+        self.coordinators: dict[Zone, DataUpdateCoordinator] = {}
+        self.zone_device_info: dict[Zone, DeviceInfo] = {}
+        self.device_entries: dict[Zone, DeviceEntry] = {}
+        self.snapshots: dict[str, dict[str, dict[str, Any]]] = {}
+        self.snapshot_store: Store = None
+        self.volume_ramps: dict[Zone, asyncio.Task] = {}
+        self.query_batcher: PioneerQueryBatcher = None
+        self.refresh_manager: "PioneerRefreshManager" = None
+        self.traffic_capture: "PioneerTrafficCapture" = None
+        self.setup_timer: "PioneerSetupTimer" = None
+        self.hotpath_timer: "PioneerHotPathTimer" = None
+        self.state_writes: dict[str, dict[str, int]] = {}  ## entity_id: counts
 
 
 ## Config attributes
@@ -144,6 +288,16 @@ ATTR_PREFIX = "prefix"
 ATTR_SUFFIX = "suffix"
 ATTR_ARGS = "args"
 ATTR_WAIT_FOR_RESPONSE = "wait_for_response"
+ATTR_SNAPSHOT_NAME = "name"
+ATTR_PERSIST = "persist"
+ATTR_RAMP_TARGET = "target"
+ATTR_RAMP_DURATION = "duration"
+ATTR_RAMP_CURVE = "curve"
+ATTR_PROPERTIES = "properties"
+ATTR_MAX_AGE = "max_age"
+ATTR_PROFILE_DURATION = "duration"
+ATTR_PROFILE_TOP = "top"
+ATTR_PROFILE_SORT = "sort"
 
 ## Amp settings attributes
 ATTR_AMP_SPEAKER_MODE = "speaker_mode"
@@ -11,6 +11,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
+from .timing import PioneerHotPathTimer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class PioneerAVRZoneCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         pioneer: PioneerAVR,
         zone: Zone,
+        hotpath_timer: PioneerHotPathTimer | None = None,
     ) -> None:
         """Initialise Pioneer AVR coordinator."""
         super().__init__(
@@ -32,8 +34,11 @@ class PioneerAVRZoneCoordinator(DataUpdateCoordinator):
         )
         self.pioneer = pioneer
         self.zone = zone
+        self.hotpath_timer = hotpath_timer
         self._initial_refresh_callback = None
         self._initial_refresh = False
+        self._power_on_callback = None
+        self._power = pioneer.properties.power.get(zone)
 
     async def _async_update_data(self) -> None:
         """Update Pioneer AVR."""
@@ -44,6 +49,10 @@ class PioneerAVRZoneCoordinator(DataUpdateCoordinator):
         """Set callback when zone is first updated."""
         self._initial_refresh_callback = initial_refresh_callback
 
+    def set_power_on_callback(self, power_on_callback: Callable[[], None]) -> None:
+        """Set callback when zone is turned on."""
+        self._power_on_callback = power_on_callback
+
     def set_zone_callback(self) -> None:
         """Set aiopioneer zone callback to trigger HA zone update."""
 
@@ -55,6 +64,18 @@ class PioneerAVRZoneCoordinator(DataUpdateCoordinator):
             ):
                 self._initial_refresh = True
                 self._initial_refresh_callback()
+            power = self.pioneer.properties.power.get(self.zone)
+            if (
+                self._power_on_callback is not None
+                and self._power is False
+                and power is True
+            ):
+                self._power_on_callback()
+            self._power = power
             self.async_set_updated_data(None)
 
+        if self.hotpath_timer is not None:
+            callback_zone_update = self.hotpath_timer.wrap(
+                callback_zone_update, "callback_zone_update", zone=self.zone
+            )
         self.pioneer.set_zone_callback(self.zone, callback_zone_update)
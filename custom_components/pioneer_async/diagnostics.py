@@ -0,0 +1,144 @@
+"""Diagnostics support for Pioneer AVR."""
+
+from typing import Any
+
+from aiopioneer.const import Zone
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import DOMAIN, PioneerData
+
+TO_REDACT = {CONF_HOST, "mac_addr", "parental_lock_password", "password"}
+PROPERTIES_EXCLUDE = ["command_queue"]
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    # pylint: disable=protected-access
+    pioneer_data: PioneerData = hass.data[DOMAIN][entry.entry_id]
+    pioneer = pioneer_data.pioneer
+    properties = pioneer.properties
+    command_queue = properties.command_queue
+
+    diagnostics = {
+        "entry": {
+            "title": entry.title,
+            "version": f"{entry.version}.{entry.minor_version}",
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "params": {
+            "user": async_redact_data(pioneer.params.user_params, TO_REDACT),
+            "effective": async_redact_data(pioneer.params.params_all, TO_REDACT),
+        },
+        "available": pioneer.available,
+        "zones": sorted(properties.zones),
+        "sources": {
+            zone: properties.get_source_dict(zone) for zone in sorted(properties.zones)
+        },
+        "properties": async_redact_data(get_properties(pioneer_data), TO_REDACT),
+        "freshness": get_freshness(pioneer_data),
+        "coordinators": {
+            zone: {
+                "listeners": len(coordinator._listeners),
+                "last_update_success": coordinator.last_update_success,
+            }
+            for zone, coordinator in pioneer_data.coordinators.items()
+        },
+        "state_writes": get_state_writes(pioneer_data),
+        "command_queue": {
+            "depth": len(command_queue.commands),
+            "commands": command_queue.commands,
+            "executing": command_queue.is_executing(),
+        },
+        "command_stats": pioneer.command_stats.as_dict(),
+        "query_batcher": pioneer_data.query_batcher.stats,
+    }
+    if (command_pacer := pioneer.command_pacer) is not None:
+        diagnostics["command_pacer"] = command_pacer.stats | {
+            "latency": command_pacer.latency,
+            "delay": command_pacer.delay,
+        }
+    if pioneer_data.hotpath_timer is not None:
+        diagnostics["hotpath_timing"] = pioneer_data.hotpath_timer.as_dict()
+    if pioneer_data.setup_timer is not None:
+        diagnostics["setup_timing"] = pioneer_data.setup_timer.as_dict()
+    return diagnostics
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a device, including config entry diagnostics."""
+    pioneer_data: PioneerData = hass.data[DOMAIN][entry.entry_id]
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    zone = next(
+        (
+            zone
+            for zone, device_info in pioneer_data.zone_device_info.items()
+            if device.identifiers & device_info.get("identifiers", set())
+        ),
+        Zone.ALL,
+    )
+    entity_ids = [
+        entity_entry.entity_id
+        for entity_entry in er.async_entries_for_device(
+            er.async_get(hass), device.id, include_disabled_entities=True
+        )
+    ]
+    properties = diagnostics["properties"]
+    diagnostics["device"] = {
+        "zone": zone,
+        "properties": {
+            base_property: value.get(zone)
+            for base_property, value in properties.items()
+            if isinstance(value, dict) and zone in value
+        },
+        "entities": {
+            entity_id: diagnostics["state_writes"]["entities"].get(entity_id)
+            for entity_id in entity_ids
+        },
+    }
+    return diagnostics
+
+
+def get_properties(pioneer_data: PioneerData) -> dict[str, Any]:
+    """Return a snapshot of the current AVR properties."""
+    return {
+        name: value
+        for name, value in vars(pioneer_data.pioneer.properties).items()
+        if not name.startswith("_") and name not in PROPERTIES_EXCLUDE
+    }
+
+
+def get_freshness(pioneer_data: PioneerData) -> dict[str, Any]:
+    """Return seconds since the AVR properties for each query were updated."""
+    pioneer = pioneer_data.pioneer
+    return {
+        "groups": pioneer_data.refresh_manager.get_group_freshness(),
+        "queries": {
+            f"{' '.join([query_command, *args])} ({zone})": round(
+                pioneer.get_query_age(query_command, zone, *args), 1
+            )
+            for query_command, zone, args in sorted(pioneer.query_updated)
+        },
+    }
+
+
+def get_state_writes(pioneer_data: PioneerData) -> dict[str, Any]:
+    """Return state write counters in total and per entity."""
+    state_writes = pioneer_data.state_writes
+    return {
+        "writes": sum(c["writes"] for c in state_writes.values()),
+        "unchanged": sum(c["unchanged"] for c in state_writes.values()),
+        "entities": dict(
+            sorted(state_writes.items(), key=lambda i: i[1]["writes"], reverse=True)
+        ),
+    }
@@ -6,12 +6,15 @@ import logging
 
 from aiopioneer.const import Zone
 from aiopioneer.exceptions import AVRError
+from aiopioneer.property_entry import AVRPropertyEntry
 
+from homeassistant.core import State, callback
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.entity import Entity
 from homeassistant.util import slugify
 
 from .const import DOMAIN, PioneerData
+from .refresh import get_refresh_group
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +26,9 @@ class PioneerEntityBase(Entity):
     _attr_has_entity_name = True
 
     available_on_zones_off = False
+    property_entry: AVRPropertyEntry | None = None
+    _state_write_counts: dict[str, int] | None = None
+    _last_state: State | None = None
 
     def __init__(self, pioneer_data: PioneerData, zone: Zone) -> None:
         """Initialize the Pioneer AVR entity base class."""
@@ -57,14 +63,84 @@ class PioneerEntityBase(Entity):
             )
         )
 
+    @property
+    def refresh_groups(self) -> set[str]:
+        """Return AVR property groups that the entity uses."""
+        if self.property_entry is None or self.property_entry.query_command is None:
+            return set()
+        if group := get_refresh_group(self.property_entry.query_command.name):
+            return {group}
+        return set()
+
+    async def async_added_to_hass(self) -> None:
+        """Register AVR property groups used by the entity."""
+        await super().async_added_to_hass()
+        self.pioneer_data.refresh_manager.add_entity_groups(self.refresh_groups)
+        self._state_write_counts = self.pioneer_data.state_writes.setdefault(
+            self.entity_id, {"writes": 0, "unchanged": 0}
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unregister AVR property groups used by the entity."""
+        self.pioneer_data.refresh_manager.remove_entity_groups(self.refresh_groups)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine, counting and timing writes."""
+        if (hotpath_timer := self.pioneer_data.hotpath_timer) is None:
+            super().async_write_ha_state()
+            if (counts := self._state_write_counts) is not None:
+                counts["writes"] += 1
+            return
+
+        with hotpath_timer.measure("entity_state", entity_id=self.entity_id):
+            super().async_write_ha_state()
+        if (counts := self._state_write_counts) is not None:
+            counts["writes"] += 1
+            ## State object is unchanged if neither state nor attributes changed
+            state = self.hass.states.get(self.entity_id)
+            if state is self._last_state:
+                counts["unchanged"] += 1
+            self._last_state = state
+
+    @property
+    def command_zone(self) -> Zone:
+        """Return zone to send AVR commands for entity."""
+        return Zone.Z1 if self.zone is Zone.ALL else self.zone
+
+    def cancel_volume_ramp(self) -> None:
+        """Cancel volume ramp in progress for the zone."""
+        task = self.pioneer_data.volume_ramps.pop(self.zone, None)
+        if task and not task.done():
+            _LOGGER.debug("cancelling volume ramp for zone %s", self.zone)
+            task.cancel()
+
     async def pioneer_command(
         self, command: str | Callable[..., Awaitable], *args, **kwargs
+    ):
+        """Execute a PioneerAVR command and handle exceptions, timing if enabled."""
+        if (hotpath_timer := self.pioneer_data.hotpath_timer) is None:
+            return await self._pioneer_command(command, *args, **kwargs)
+        with hotpath_timer.measure("pioneer_command", check_slow=False):
+            return await self._pioneer_command(command, *args, **kwargs)
+
+    async def _pioneer_command(
+        self, command: str | Callable[..., Awaitable], *args, **kwargs
     ):
         """Execute a PioneerAVR command and handle exceptions."""
         command_name = "(unknown)"
+        if not (isinstance(command, str) and command.startswith("query_")):
+            self.cancel_volume_ramp()  ## new command for zone overrides volume ramp
+            self.pioneer_data.refresh_manager.notify_activity()
         try:
             if isinstance(command, str):
                 command_name = command
+                if command.startswith("query_") and kwargs.keys() <= {"zone"}:
+                    ## Batch with concurrent queries from other entity updates
+                    return await self.pioneer_data.query_batcher.query(
+                        command, *args, **kwargs
+                    )
                 return await self.pioneer.send_command(command, *args, **kwargs)
             command_name = command.__name__
             return await command(*args, **kwargs)
@@ -92,6 +168,11 @@ class PioneerEntityBase(Entity):
 class PioneerTunerEntity(PioneerEntityBase):
     """Pioneer AVR tuner entity."""
 
+    @property
+    def refresh_groups(self) -> set[str]:
+        """Return AVR property groups that the entity uses."""
+        return {"tuner"}
+
     @property
     def available(self) -> bool:
         """Returns whether the AVR is available and source is set to tuner."""
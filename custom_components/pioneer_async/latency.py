@@ -0,0 +1,195 @@
+"""Pioneer AVR command latency statistics."""
+
+import asyncio
+from contextvars import ContextVar
+import time
+from typing import Any
+
+from .const import COMMAND_LATENCY_BUCKETS
+
+COMMAND_TOTAL = "total"
+
+
+class PioneerLatencyHistogram:
+    """Histogram of latencies in milliseconds with fixed bucket bounds."""
+
+    def __init__(self, bounds: list[float] = COMMAND_LATENCY_BUCKETS) -> None:
+        """Initialize the latency histogram."""
+        self.bounds = bounds  ## bucket upper bounds, with a final overflow bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record a latency in milliseconds."""
+        index = 0
+        while index < len(self.bounds) and latency > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a latency percentile, interpolated within its bucket."""
+        if not self.count:
+            return None
+        rank = self.count * percentile / 100
+        cumulative = 0
+        lower = 0.0
+        for index, count in enumerate(self.counts):
+            upper = self.bounds[index] if index < len(self.bounds) else self.max
+            upper = min(upper, self.max)
+            if count and cumulative + count >= rank:
+                return round(lower + (upper - lower) * (rank - cumulative) / count, 3)
+            cumulative += count
+            lower = upper
+        return round(self.max, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return histogram bucket counts and summary statistics."""
+        buckets = {f"<={b}": c for b, c in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class PioneerCommandTypeStats:
+    """Latency histograms and error counters for an AVR command type."""
+
+    def __init__(self) -> None:
+        """Initialize the command type statistics."""
+        self.queue_wait = PioneerLatencyHistogram()  ## call to command sent
+        self.response = PioneerLatencyHistogram()  ## command sent to response
+        self.stats = {
+            "commands": 0,  ## commands sent by send_command
+            "responses": 0,  ## responses received
+            "timeouts": 0,  ## response timeouts
+            "busy": 0,  ## busy responses from the AVR
+            "errors": 0,  ## other error responses, eg. unsupported command
+            "retries": 0,  ## commands resent after an error response
+        }
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return proportion of commands that timed out or found the AVR busy."""
+        if not self.stats["commands"]:
+            return None
+        return (self.stats["timeouts"] + self.stats["busy"]) / self.stats["commands"]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters and latency histograms."""
+        return self.stats | {
+            "error_rate": (
+                round(self.error_rate, 4) if self.error_rate is not None else None
+            ),
+            "queue_wait_ms": self.queue_wait.as_dict(),
+            "response_ms": self.response.as_dict(),
+        }
+
+
+class _CommandTiming:
+    """Timing of a command in progress."""
+
+    __slots__ = ("command", "task", "start", "sent", "sends")
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.task = asyncio.current_task()
+        self.start = time.monotonic()
+        self.sent: float | None = None  ## time the command was (last) sent
+        self.sends = 0
+
+
+_command_timing: ContextVar[_CommandTiming | None] = ContextVar(
+    "pioneer_command_timing", default=None
+)
+
+
+class PioneerCommandStats:
+    """Record latency and errors of AVR commands by command type.
+
+    Queue wait is the time from send_command being called to the command
+    being sent to the AVR, including waiting for other requests in progress
+    and the command delay. Response latency is the time from the command
+    being (re)sent to the AVR response being received. Timings are tracked
+    per task, so concurrent commands are timed independently.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the Pioneer AVR command statistics."""
+        self.total = PioneerCommandTypeStats()
+        self.commands: dict[str, PioneerCommandTypeStats] = {}
+
+    def start(self, command: str) -> object:
+        """Start timing a command, and return a token to finish timing."""
+        return _command_timing.set(_CommandTiming(command))
+
+    def finish(self, token: object) -> None:
+        """Finish timing a command and record its statistics."""
+        timing = _command_timing.get()
+        _command_timing.reset(token)
+        if timing is None or timing.sends == 0:
+            return
+        for command_stats in self._get_command_stats(timing.command):
+            command_stats.stats["commands"] += 1
+            command_stats.stats["retries"] += timing.sends - 1
+
+    def record_sent(self) -> None:
+        """Record that the command in progress has been sent to the AVR."""
+        if (timing := self._get_timing()) is None:
+            return
+        timing.sent = time.monotonic()
+        timing.sends += 1
+        if timing.sends == 1:
+            queue_wait = (timing.sent - timing.start) * 1000
+            for command_stats in self._get_command_stats(timing.command):
+                command_stats.queue_wait.record(queue_wait)
+
+    def record_response(self) -> None:
+        """Record that a response has been received for the command in progress."""
+        if (timing := self._get_timing()) is None or timing.sent is None:
+            return
+        latency = (time.monotonic() - timing.sent) * 1000
+        for command_stats in self._get_command_stats(timing.command):
+            command_stats.stats["responses"] += 1
+            command_stats.response.record(latency)
+
+    def record_error(self, timeout: bool = False, busy: bool = False) -> None:
+        """Record a response timeout or error response for the command in progress."""
+        if (timing := self._get_timing()) is None:
+            return
+        counter = "timeouts" if timeout else "busy" if busy else "errors"
+        for command_stats in self._get_command_stats(timing.command):
+            command_stats.stats[counter] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics for all commands and for each command type."""
+        return {
+            COMMAND_TOTAL: self.total.as_dict(),
+            "commands": {
+                command: command_stats.as_dict()
+                for command, command_stats in sorted(self.commands.items())
+            },
+        }
+
+    def _get_timing(self) -> _CommandTiming | None:
+        """Return timing of the command in progress in the current task."""
+        timing = _command_timing.get()
+        if timing is None or timing.task is not asyncio.current_task():
+            return None  ## ignore timing inherited by tasks created by a command
+        return timing
+
+    def _get_command_stats(self, command: str) -> list[PioneerCommandTypeStats]:
+        """Return statistics to update for a command."""
+        if (command_stats := self.commands.get(command)) is None:
+            command_stats = self.commands[command] = PioneerCommandTypeStats()
+        return [self.total, command_stats]
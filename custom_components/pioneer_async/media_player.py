@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import json
-from typing import Any
+import time
+from typing import Any, Callable
 
 import voluptuous as vol
 
 from aiopioneer.const import Zone
+from aiopioneer.decoders.code_map import CodeMapBase
+from aiopioneer.exceptions import AVRCommandError
+from aiopioneer.params import PARAM_COMMAND_DELAY, PARAM_VOLUME_STEP_ONLY
+from aiopioneer.property_entry import AVRPropertyEntry
+from aiopioneer.property_registry import PROPERTY_REGISTRY
 
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -18,14 +25,14 @@ from homeassistant.components.media_player.const import (
     MediaPlayerState,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import STATE_UNKNOWN
+from homeassistant.const import CONF_TIMEOUT, STATE_UNKNOWN
 from homeassistant.core import (
     HomeAssistant,
     ServiceCall,
     ServiceResponse,
     SupportsResponse,
 )
-from homeassistant.exceptions import PlatformNotReady
+from homeassistant.exceptions import PlatformNotReady, ServiceValidationError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -36,12 +43,30 @@ from .const import (
     SERVICE_SET_AMP_SETTINGS,
     SERVICE_SET_VIDEO_SETTINGS,
     SERVICE_SET_DSP_SETTINGS,
+    SERVICE_SNAPSHOT,
+    SERVICE_RESTORE,
+    SERVICE_VOLUME_RAMP,
+    SERVICE_GET_PROPERTIES,
+    SNAPSHOT_DEFAULT_NAME,
+    SNAPSHOT_SETTINGS,
+    CONF_VOLUME_STEP_BURST,
+    VOLUME_STEP_POLL_INTERVAL,
+    DEFAULT_VOLUME_RAMP_DURATION,
+    VOLUME_RAMP_CURVES,
+    DEFAULT_PROPERTY_MAX_AGE,
     PioneerData,
     ATTR_COMMAND,
     ATTR_PREFIX,
     ATTR_SUFFIX,
     ATTR_ARGS,
     ATTR_WAIT_FOR_RESPONSE,
+    ATTR_SNAPSHOT_NAME,
+    ATTR_PERSIST,
+    ATTR_RAMP_TARGET,
+    ATTR_RAMP_DURATION,
+    ATTR_RAMP_CURVE,
+    ATTR_PROPERTIES,
+    ATTR_MAX_AGE,
     ATTR_AMP_SPEAKER_MODE,
     ATTR_AMP_HDMI_OUT,
     ATTR_AMP_HDMI3_OUT,
@@ -108,6 +133,8 @@ from .const import (
     ATTR_DSP_RENDERING_MODE,
 )
 from .entity_base import PioneerEntityBase
+from .refresh import get_property_value, get_query_args
+from .timing import PHASE_SETUP, PHASE_PLATFORMS, timed_platform_setup
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -123,6 +150,37 @@ PIONEER_SEND_COMMAND_SCHEMA = {
     vol.Optional(ATTR_WAIT_FOR_RESPONSE): cv.boolean,
 }
 
+PIONEER_SNAPSHOT_SCHEMA = {
+    vol.Optional(ATTR_SNAPSHOT_NAME, default=SNAPSHOT_DEFAULT_NAME): cv.string,
+    vol.Optional(ATTR_PERSIST, default=False): cv.boolean,
+}
+
+PIONEER_RESTORE_SCHEMA = {
+    vol.Optional(ATTR_SNAPSHOT_NAME, default=SNAPSHOT_DEFAULT_NAME): cv.string,
+}
+
+PIONEER_VOLUME_RAMP_SCHEMA = {
+    vol.Required(ATTR_RAMP_TARGET): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    vol.Optional(ATTR_RAMP_DURATION, default=DEFAULT_VOLUME_RAMP_DURATION): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=3600)
+    ),
+    vol.Optional(ATTR_RAMP_CURVE, default="linear"): vol.In(VOLUME_RAMP_CURVES),
+}
+
+PIONEER_GET_PROPERTIES_SCHEMA = {
+    vol.Required(ATTR_PROPERTIES): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_MAX_AGE, default=DEFAULT_PROPERTY_MAX_AGE): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+}
+
+VOLUME_RAMP_CURVE_FUNCTIONS = {
+    "linear": lambda x: x,
+    "ease_in": lambda x: x * x,
+    "ease_out": lambda x: 1 - (1 - x) * (1 - x),
+    "ease_in_out": lambda x: x * x * (3 - 2 * x),
+}
+
 PIONEER_SET_AMP_SETTINGS_SCHEMA = {
     vol.Optional(ATTR_AMP_SPEAKER_MODE): cv.string,
     vol.Optional(ATTR_AMP_HDMI_OUT): cv.string,
@@ -223,6 +281,7 @@ PIONEER_SET_DSP_SETTINGS_SCHEMA = {
 }
 
 
+@timed_platform_setup("media_player")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -245,7 +304,10 @@ async def async_setup_entry(
         _LOGGER.debug("Created entity for zone %s", zone)
 
     try:
-        await pioneer.refresh()
+        with pioneer_data.setup_timer.phase(
+            PHASE_SETUP, PHASE_PLATFORMS, "media_player", "refresh"
+        ):
+            await pioneer.refresh()
     except Exception as exc:  # pylint: disable=broad-except
         _LOGGER.error("Could not perform AVR initial update: %s", repr(exc))
         raise PlatformNotReady  # pylint: disable=raise-missing-from
@@ -276,6 +338,29 @@ async def async_setup_entry(
         PIONEER_SET_DSP_SETTINGS_SCHEMA,
         "async_set_dsp_settings",
     )
+    platform.async_register_entity_service(
+        SERVICE_SNAPSHOT,
+        PIONEER_SNAPSHOT_SCHEMA,
+        "async_snapshot",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        SERVICE_RESTORE,
+        PIONEER_RESTORE_SCHEMA,
+        "async_restore",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        SERVICE_VOLUME_RAMP,
+        PIONEER_VOLUME_RAMP_SCHEMA,
+        "async_volume_ramp",
+    )
+    platform.async_register_entity_service(
+        SERVICE_GET_PROPERTIES,
+        PIONEER_GET_PROPERTIES_SCHEMA,
+        "async_get_properties",
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 class PioneerZone(
@@ -285,6 +370,7 @@ class PioneerZone(
 
     _attr_device_class = CLASS_PIONEER
     _attr_name = None
+    _predicted_volume: int | None = None
     _unrecorded_attributes = frozenset(
         {
             "sources_json",
@@ -313,7 +399,9 @@ class PioneerZone(
     @property
     def volume_level(self) -> float:
         """Volume level of the media player (0..1)."""
-        volume = self.pioneer.properties.volume.get(self.zone)
+        volume = self._predicted_volume
+        if volume is None:
+            volume = self.pioneer.properties.volume.get(self.zone)
         max_volume = self.pioneer.properties.max_volume.get(self.zone)
         return volume / max_volume if (volume and max_volume) else float(0)
 
@@ -475,10 +563,155 @@ class PioneerZone(
         """Set volume level, range 0..1."""
         max_volume = self.pioneer.properties.max_volume.get(self.zone)
         target_volume = round(volume * max_volume)
+        if self.pioneer.params.get_param(
+            PARAM_VOLUME_STEP_ONLY
+        ) and self.entry_options.get(CONF_VOLUME_STEP_BURST):
+            await self.pioneer_command(self.step_volume_level, target_volume)
+            return
         await self.pioneer_command(
             self.pioneer.set_volume_level, target_volume=target_volume, zone=self.zone
         )
 
+    async def step_volume_level(self, target_volume: int) -> None:
+        """Set volume level by sending volume steps to the AVR in bursts."""
+        pioneer = self.pioneer
+        zone = self.zone
+        burst_size = self.entry_options[CONF_VOLUME_STEP_BURST]
+        start_volume = pioneer.properties.volume.get(zone)
+        if target_volume == start_volume:
+            return
+        command = "volume_up" if target_volume > start_volume else "volume_down"
+
+        ## Send first step and wait for response to determine volume step size
+        await pioneer.send_command(command, zone=zone)
+        volume = pioneer.properties.volume.get(zone)
+        step_size = abs(volume - start_volume)
+        if not step_size or (volume > start_volume) != (target_volume > start_volume):
+            raise AVRCommandError(
+                command="set_volume_level", err=f"AVR {command} failed", zone=zone
+            )
+        _LOGGER.debug(
+            ">> step_volume_level(%s, %d -> %d, step_size=%d)",
+            zone,
+            start_volume,
+            target_volume,
+            step_size,
+        )
+
+        try:
+            while steps := min(abs(target_volume - volume) // step_size, burst_size):
+                for _ in range(steps):
+                    await pioneer.send_command(
+                        command, zone=zone, wait_for_response=False
+                    )
+                burst_volume = volume
+                self._predicted_volume = volume + steps * step_size * (
+                    1 if command == "volume_up" else -1
+                )
+                self.async_write_ha_state()
+
+                ## Wait for AVR to report volume for burst before sending next burst
+                timeout = time.monotonic() + self.entry_options[CONF_TIMEOUT]
+                while (
+                    pioneer.properties.volume.get(zone) != self._predicted_volume
+                    and time.monotonic() < timeout
+                ):
+                    await asyncio.sleep(VOLUME_STEP_POLL_INTERVAL)
+                volume = pioneer.properties.volume.get(zone)
+                if volume == burst_volume:
+                    raise AVRCommandError(
+                        command="set_volume_level",
+                        err=f"AVR {command} failed",
+                        zone=zone,
+                    )
+        finally:
+            ## Correct predicted volume with actual volume reported by AVR
+            self._predicted_volume = None
+            await pioneer.send_command("query_volume", zone=zone)
+            self.async_write_ha_state()
+
+    async def async_volume_ramp(
+        self,
+        target: float,
+        duration: float = DEFAULT_VOLUME_RAMP_DURATION,
+        curve: str = "linear",
+    ) -> None:
+        """Ramp volume to target level (0..1) over duration seconds."""
+        max_volume = self.pioneer.properties.max_volume.get(self.zone)
+        if max_volume is None or self.pioneer.properties.volume.get(self.zone) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="volume_unavailable",
+                translation_placeholders={"zone": self.zone},
+            )
+        self.cancel_volume_ramp()
+        self.pioneer_data.volume_ramps[self.zone] = (
+            self.hass.async_create_background_task(
+                self._volume_ramp(round(target * max_volume), duration, curve),
+                name=f"{DOMAIN} volume ramp zone {self.zone}",
+            )
+        )
+
+    async def _volume_ramp(
+        self, target_volume: int, duration: float, curve: str
+    ) -> None:
+        """Step volume towards target volume, paced to the AVR command delay."""
+        pioneer = self.pioneer
+        zone = self.zone
+        start_volume = pioneer.properties.volume.get(zone)
+        curve_function = VOLUME_RAMP_CURVE_FUNCTIONS[curve]
+        step_only = pioneer.params.get_param(PARAM_VOLUME_STEP_ONLY)
+        interval = max(
+            pioneer.params.get_param(PARAM_COMMAND_DELAY),
+            duration / max(abs(target_volume - start_volume), 1),
+        )
+        _LOGGER.debug(
+            ">> volume_ramp(%s, %d -> %d, duration=%s, curve=%s, interval=%.3f)",
+            zone,
+            start_volume,
+            target_volume,
+            duration,
+            curve,
+            interval,
+        )
+
+        try:
+            start_time = time.monotonic()
+            tick = 0
+            while (
+                target_volume != start_volume
+                and (elapsed := time.monotonic() - start_time) < duration
+            ):
+                ramp_volume = round(
+                    start_volume
+                    + (target_volume - start_volume)
+                    * curve_function(elapsed / duration)
+                )
+                current_volume = pioneer.properties.volume.get(zone)
+                if step_only:
+                    if ramp_volume > current_volume:
+                        await pioneer.volume_up(zone=zone)
+                    elif ramp_volume < current_volume:
+                        await pioneer.volume_down(zone=zone)
+                elif ramp_volume != current_volume:
+                    await pioneer.set_volume_level(ramp_volume, zone=zone)
+
+                ## Schedule against ramp start time to avoid accumulating jitter
+                tick += 1
+                await asyncio.sleep(
+                    max(0, start_time + tick * interval - time.monotonic())
+                )
+            if pioneer.properties.volume.get(zone) != target_volume:
+                await pioneer.set_volume_level(target_volume, zone=zone)
+        except asyncio.CancelledError:
+            _LOGGER.debug("volume ramp for zone %s cancelled", zone)
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.error("volume ramp for zone %s failed: %s", zone, repr(exc))
+        finally:
+            if self.pioneer_data.volume_ramps.get(zone) is asyncio.current_task():
+                del self.pioneer_data.volume_ramps[zone]
+
     async def async_mute_volume(self, mute: bool) -> None:
         """Mute (true) or unmute (false) media player."""
         if mute:
@@ -533,3 +766,293 @@ class PioneerZone(
         await self.pioneer_command(
             self.pioneer.set_dsp_settings, zone=self.zone, **kwargs
         )
+
+    def _get_snapshot_settings(
+        self,
+    ) -> list[tuple[str, str, type[CodeMapBase], Zone, str]]:
+        """Return settings supported by snapshot for zone, in restore order."""
+        property_entries = {
+            (code_map.base_property, code_map.property_name): property_entry
+            for code_map, property_entry in PROPERTY_REGISTRY.code_map_index.items()
+            if property_entry.set_command is not None
+        }
+        settings = []
+        for base_property, property_names in SNAPSHOT_SETTINGS.items():
+            for property_name in property_names:
+                property_entry = property_entries.get((base_property, property_name))
+                if (
+                    property_entry is None
+                    or self.zone not in property_entry.set_command.avr_commands
+                ):
+                    continue
+                code_map = property_entry.code_map
+                property_zone = (
+                    Zone.ALL if Zone.ALL in code_map.supported_zones else self.zone
+                )
+                settings.append(
+                    (
+                        base_property,
+                        property_name,
+                        code_map,
+                        property_zone,
+                        property_entry.set_command.name,
+                    )
+                )
+        return settings
+
+    async def async_snapshot(
+        self, name: str = SNAPSHOT_DEFAULT_NAME, persist: bool = False
+    ) -> ServiceResponse:
+        """Save current zone state to a named snapshot."""
+        properties = self.pioneer.properties
+        zone = self.zone
+        snapshot = {
+            "power": properties.power.get(zone),
+            "source_id": properties.source_id.get(zone),
+            "volume": properties.volume.get(zone),
+            "mute": properties.mute.get(zone),
+        }
+        if zone is Zone.Z1:
+            snapshot["listening_mode"] = properties.listening_mode
+        for (
+            base_property,
+            property_name,
+            code_map,
+            property_zone,
+            _,
+        ) in self._get_snapshot_settings():
+            value = code_map.get_property_value(properties, property_zone)
+            if value is not None:
+                snapshot.setdefault(base_property, {})[property_name] = value
+        if channel_levels := properties.channel_level.get(zone):
+            snapshot["channel_level"] = dict(channel_levels)
+        snapshot = {k: v for k, v in snapshot.items() if v is not None}
+        _LOGGER.debug(">> snapshot(%s, name=%s): %s", zone, name, snapshot)
+
+        pioneer_data = self.pioneer_data
+        zone_snapshots = pioneer_data.snapshots.setdefault(str(zone), {})
+        previous = zone_snapshots.get(name)
+        zone_snapshots[name] = snapshot | {ATTR_PERSIST: persist}
+        if persist or (previous and previous[ATTR_PERSIST]):
+            ## Also save if a persisted snapshot is overwritten by a non-persisted one
+            await pioneer_data.snapshot_store.async_save(
+                {
+                    z: {n: s for n, s in snapshots.items() if s[ATTR_PERSIST]}
+                    for z, snapshots in pioneer_data.snapshots.items()
+                }
+            )
+        return snapshot
+
+    async def async_restore(self, name: str = SNAPSHOT_DEFAULT_NAME) -> ServiceResponse:
+        """Restore zone state from a named snapshot."""
+        snapshot = self.pioneer_data.snapshots.get(str(self.zone), {}).get(name)
+        if snapshot is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="snapshot_not_found",
+                translation_placeholders={"name": name, "zone": self.zone},
+            )
+        _LOGGER.debug(">> restore(%s, name=%s): %s", self.zone, name, snapshot)
+        commands = await self.pioneer_command(self._replay_snapshot, snapshot)
+        return {"commands": commands}
+
+    async def _replay_snapshot(self, snapshot: dict[str, Any]) -> list[str]:
+        """Send only the commands required to return zone to snapshot state."""
+        pioneer = self.pioneer
+        properties = pioneer.properties
+        zone = self.zone
+        commands = []
+
+        ## Power state first: nothing else can be set on a zone that is off
+        power = snapshot.get("power")
+        if power is False:
+            if properties.power.get(zone):
+                await pioneer.power_off(zone=zone)
+                commands.append("power_off")
+            return commands
+        if power and not properties.power.get(zone):
+            await pioneer.power_on(zone=zone)
+            commands.append("power_on")
+            await pioneer.refresh(zones=[zone])  ## compare against powered on state
+
+        ## Source next, as source determines available listening modes
+        source_id = snapshot.get("source_id")
+        if source_id is not None and source_id != properties.source_id.get(zone):
+            await pioneer.select_source(source_id, zone=zone)
+            commands.append("select_source")
+
+        ## Pipeline all other changed settings, then verify them with one query
+        changes: list[tuple[str, tuple, Any, Callable[[], Any]]] = []
+
+        def queue_command(
+            command: str, *args, value: Any, get_value: Callable[[], Any]
+        ) -> None:
+            changes.append((command, args, value, get_value))
+
+        volume = snapshot.get("volume")
+        step_volume = False
+        if volume is not None and volume != properties.volume.get(zone):
+            if pioneer.params.get_param(PARAM_VOLUME_STEP_ONLY):
+                step_volume = True
+            else:
+                queue_command(
+                    "set_volume_level",
+                    volume,
+                    value=volume,
+                    get_value=lambda: properties.volume.get(zone),
+                )
+        mute = snapshot.get("mute")
+        if mute is not None and mute != properties.mute.get(zone):
+            queue_command(
+                "mute_on" if mute else "mute_off",
+                value=mute,
+                get_value=lambda: properties.mute.get(zone),
+            )
+        listening_mode = snapshot.get("listening_mode")
+        if listening_mode is not None and listening_mode != properties.listening_mode:
+            queue_command(
+                "select_listening_mode",
+                listening_mode,
+                value=listening_mode,
+                get_value=lambda: properties.listening_mode,
+            )
+
+        tone_status = snapshot.get("tone", {}).get("status")
+        for (
+            base_property,
+            property_name,
+            code_map,
+            property_zone,
+            set_command,
+        ) in self._get_snapshot_settings():
+            value = snapshot.get(base_property, {}).get(property_name)
+            if value is None or value == code_map.get_property_value(
+                properties, property_zone
+            ):
+                continue
+            if base_property == "tone" and property_name != "status":
+                if tone_status != "on":  ## tone bass/treble only settable when on
+                    continue
+            queue_command(
+                set_command,
+                value,
+                value=value,
+                get_value=lambda c=code_map, z=property_zone: c.get_property_value(
+                    properties, z
+                ),
+            )
+
+        channel_levels = properties.channel_level.get(zone, {})
+        for channel, level in snapshot.get("channel_level", {}).items():
+            if level != channel_levels.get(channel):
+                queue_command(
+                    "set_channel_level",
+                    channel,
+                    level,
+                    value=level,
+                    get_value=lambda c=channel: properties.channel_level.get(
+                        zone, {}
+                    ).get(c),
+                )
+
+        if changes:
+            sent = []
+            async with properties.command_queue:  ## hold off queued commands
+                for change in changes:
+                    command, args = change[:2]
+                    if await pioneer.send_command(
+                        command,
+                        *args,
+                        zone=zone,
+                        ignore_error=False,
+                        wait_for_response=False,
+                    ):
+                        sent.append(change)
+                ## AVR responds in order, so the response to this query arrives
+                ## after the AVR has responded to all of the commands sent
+                await pioneer.send_command("query_power", zone=zone)
+            for command, _, value, get_value in sent:
+                if get_value() == value:
+                    commands.append(command)
+                else:
+                    _LOGGER.warning("restore(%s): AVR did not apply %s", zone, command)
+        if step_volume:
+            if self.entry_options.get(CONF_VOLUME_STEP_BURST):
+                await self.step_volume_level(volume)
+            else:
+                await pioneer.set_volume_level(volume, zone=zone)
+            commands.append("set_volume_level")
+        return commands
+
+    async def async_get_properties(
+        self, properties: list[str], max_age: float = DEFAULT_PROPERTY_MAX_AGE
+    ) -> ServiceResponse:
+        """Return AVR properties, querying the AVR only for stale properties."""
+        property_entries: dict[str, AVRPropertyEntry] = {}
+        for code_map, property_entry in PROPERTY_REGISTRY.code_map_index.items():
+            if code_map.base_property and property_entry.query_command is not None:
+                property_key = code_map.base_property
+                if code_map.property_name:
+                    property_key += f".{code_map.property_name}"
+                property_entries.setdefault(property_key, property_entry)
+
+        ## Determine properties that are not in the cache or are stale
+        queries: dict[tuple[str, tuple], Zone] = {}
+        for property_key in properties:
+            if (property_entry := property_entries.get(property_key)) is None:
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="unknown_property",
+                    translation_placeholders={"property": property_key},
+                )
+            query_command = property_entry.query_command
+            query_zone = self.zone
+            if query_zone not in query_command.avr_commands:
+                query_zone = Zone.Z1  ## global properties are queried via Zone 1
+            args_list = get_query_args(
+                query_command.name, query_zone, self.pioneer.properties
+            )
+            if not args_list:
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="property_query_arguments",
+                    translation_placeholders={"property": property_key},
+                )
+            for args in args_list:
+                age = self.pioneer.get_query_age(query_command.name, query_zone, *args)
+                if age is None or age > max_age:
+                    queries[(query_command.name, args)] = query_zone
+
+        results = await asyncio.gather(
+            *(
+                self.pioneer_command(query, *args, zone=query_zone)
+                for (query, args), query_zone in queries.items()
+            ),
+            return_exceptions=True,
+        )
+        queried = []
+        failed = []
+        for (query, args), result in zip(queries, results):
+            query_name = " ".join([query, *args])
+            if isinstance(result, Exception):
+                _LOGGER.warning(
+                    "get_properties query %s failed: %s", query_name, result
+                )
+                failed.append(query_name)
+            else:
+                queried.append(query_name)
+
+        values = {
+            property_key: get_property_value(
+                self.pioneer.properties, property_key, self.zone
+            )
+            for property_key in properties
+        }
+        _LOGGER.debug(
+            ">> get_properties(%s, max_age=%s): queried %s, failed %s",
+            self.zone,
+            max_age,
+            queried,
+            failed,
+        )
+        return {"properties": values, "queried": queried, "failed": failed}
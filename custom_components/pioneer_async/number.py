@@ -36,11 +36,13 @@ from .const import (
     DEFAULT_ENABLED_CHANNELS,
 )
 from .entity_base import PioneerEntityBase, PioneerTunerEntity
+from .timing import timed_platform_setup
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@timed_platform_setup("number")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -153,7 +155,9 @@ class PioneerGenericNumber(PioneerNumber):
 
     async def async_update(self) -> None:
         """Refresh the AVR property."""
-        await self.pioneer_command(self.property_entry.query_command.name)
+        await self.pioneer_command(
+            self.property_entry.query_command.name, zone=self.command_zone
+        )
 
 
 class TunerFrequencyNumber(PioneerTunerEntity, PioneerNumber):
@@ -274,7 +278,9 @@ class ChannelLevelNumber(PioneerGenericNumber):
 
     async def async_update(self) -> None:
         """Refresh the channel level."""
-        await self.pioneer_command("query_channel_level", self.channel)
+        await self.pioneer_command(
+            "query_channel_level", self.channel, zone=self.command_zone
+        )
 
 
 class ToneNumber(PioneerGenericNumber):
@@ -0,0 +1,91 @@
+"""Pioneer AVR adaptive command pacing."""
+
+import logging
+
+from aiopioneer.params import AVRParams, PARAM_COMMAND_DELAY
+
+from .const import (
+    COMMAND_PACING_DECREASE,
+    COMMAND_PACING_INCREASE_FACTOR,
+    COMMAND_PACING_INCREASE_MIN,
+    COMMAND_PACING_SLOW_FACTOR,
+    COMMAND_PACING_SLOW_MIN,
+    COMMAND_PACING_LATENCY_WEIGHT,
+    COMMAND_PACING_APPLY_DECREASE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PioneerCommandPacer:
+    """Tune the delay between AVR commands to the responsiveness of the AVR.
+
+    The command delay is decreased additively after each timely response, and
+    increased multiplicatively after a response timeout, a busy response or a
+    slow response (AIMD).
+
+    Updating the command delay parameter merges all AVR parameters, so
+    increases are applied immediately but decreases are only applied once
+    they reach COMMAND_PACING_APPLY_DECREASE or the minimum delay.
+    """
+
+    def __init__(self, params: AVRParams, delay_min: float, delay_max: float) -> None:
+        """Initialize the Pioneer AVR command pacer."""
+        self.params = params
+        self.delay_min = delay_min
+        self.delay_max = max(delay_min, delay_max)
+        self.latency: float | None = None  ## smoothed response latency
+        self.stats = {
+            "responses": 0,  ## responses received
+            "slow": 0,  ## responses that took much longer than usual
+            "errors": 0,  ## busy responses from the AVR
+            "timeouts": 0,  ## response timeouts
+        }
+        self.delay = None
+        self._set_delay(params.get_param(PARAM_COMMAND_DELAY), apply=True)
+
+    def record_response(self, latency: float) -> None:
+        """Record the latency of a response and adjust the command delay."""
+        self.stats["responses"] += 1
+        if self.latency is not None and latency > max(
+            self.latency * COMMAND_PACING_SLOW_FACTOR, COMMAND_PACING_SLOW_MIN
+        ):
+            self.stats["slow"] += 1
+            self._increase_delay()
+        else:
+            self._set_delay(self.delay - COMMAND_PACING_DECREASE)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * COMMAND_PACING_LATENCY_WEIGHT
+
+    def record_error(self, timeout: bool = False) -> None:
+        """Record a response timeout or busy response and back off."""
+        self.stats["timeouts" if timeout else "errors"] += 1
+        self._increase_delay()
+
+    def _increase_delay(self) -> None:
+        """Increase the command delay multiplicatively."""
+        self._set_delay(
+            max(
+                self.delay * COMMAND_PACING_INCREASE_FACTOR,
+                self.delay + COMMAND_PACING_INCREASE_MIN,
+            )
+        )
+
+    def _set_delay(self, delay: float, apply: bool = False) -> None:
+        """Set the command delay within the configured bounds."""
+        delay = round(min(max(delay, self.delay_min), self.delay_max), 3)
+        if delay == self.delay:
+            return
+        if self.delay is not None and delay > self.delay:
+            _LOGGER.debug("increasing command delay to %.3fs", delay)
+        self.delay = delay
+        applied_delay = self.params.get_param(PARAM_COMMAND_DELAY)
+        if delay != applied_delay and (
+            apply
+            or delay > applied_delay
+            or delay == self.delay_min
+            or round(applied_delay - delay, 3) >= COMMAND_PACING_APPLY_DECREASE
+        ):
+            self.params.set_user_param(PARAM_COMMAND_DELAY, delay)
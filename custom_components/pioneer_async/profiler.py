@@ -0,0 +1,151 @@
+"""Pioneer AVR integration profiler action."""
+
+import asyncio
+import cProfile
+import logging
+import pstats
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DATA_PROFILER,
+    SERVICE_PROFILE,
+    ATTR_PROFILE_DURATION,
+    ATTR_PROFILE_TOP,
+    ATTR_PROFILE_SORT,
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_PROFILE_TOP,
+    PROFILE_SORT_KEYS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_MODULES = ["custom_components/pioneer_async/", "aiopioneer/"]
+
+PIONEER_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_PROFILE_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(ATTR_PROFILE_TOP, default=DEFAULT_PROFILE_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+        vol.Optional(ATTR_PROFILE_SORT, default=PROFILE_SORT_KEYS[0]): vol.In(
+            PROFILE_SORT_KEYS
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration-wide actions."""
+
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        return await async_profile(
+            hass,
+            duration=call.data[ATTR_PROFILE_DURATION],
+            top=call.data[ATTR_PROFILE_TOP],
+            sort=call.data[ATTR_PROFILE_SORT],
+        )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PIONEER_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def async_profile(
+    hass: HomeAssistant, duration: float, top: int, sort: str
+) -> ServiceResponse:
+    """Profile the event loop and summarise integration and aiopioneer functions.
+
+    cProfile profiles all code run on the event loop while it is enabled. The
+    full profile is written to the Home Assistant configuration directory for
+    analysis with tools such as snakeviz, and the top functions belonging to
+    the integration and aiopioneer are returned.
+    """
+    if hass.data.get(DATA_PROFILER):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="profiler_running"
+        )
+    hass.data[DATA_PROFILER] = True
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:  ## another profiler is active
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="profiler_running"
+            ) from exc
+        _LOGGER.info("profiling for %.0fs", duration)
+        start = time.perf_counter()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        timestamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        path = hass.config.path(f"{DOMAIN}_profile_{timestamp}.prof")
+        try:
+            functions = await hass.async_add_executor_job(
+                _dump_profile, profiler, path, top, sort
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="profile_write_failed",
+                translation_placeholders={"path": path, "exc": repr(exc)},
+            ) from exc
+    finally:
+        hass.data[DATA_PROFILER] = False
+    _LOGGER.info("profile written to %s", path)
+    return {
+        "file": path,
+        "duration": round(elapsed, 3),
+        "functions": functions,
+    }
+
+
+def _dump_profile(
+    profiler: cProfile.Profile, path: str, top: int, sort: str
+) -> list[dict[str, float | int | str]]:
+    """Write profile to file and return the top integration functions."""
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler)
+    functions = []
+    # pylint: disable=no-member
+    for (filename, lineno, name), func_stats in stats.stats.items():
+        _, calls, tottime, cumtime, _ = func_stats
+        filename = filename.replace("\\", "/")
+        for module in PROFILE_MODULES:
+            if (index := filename.rfind(module)) >= 0:
+                functions.append(
+                    {
+                        "function": f"{filename[index:]}:{lineno}({name})",
+                        "calls": calls,
+                        "tottime": round(tottime, 6),
+                        "cumulative": round(cumtime, 6),
+                    }
+                )
+                break
+    functions.sort(key=lambda f: f[sort], reverse=True)
+    return functions[:top]
@@ -0,0 +1,101 @@
+"""Pioneer AVR query batching and deduplication."""
+
+import asyncio
+import logging
+from typing import Any
+
+from aiopioneer import PioneerAVR
+from aiopioneer.const import Zone
+
+_LOGGER = logging.getLogger(__name__)
+
+QueryKey = tuple[str, tuple, Zone]
+
+
+class PioneerQueryBatcher:
+    """Collect AVR queries requested within a short window and send each once."""
+
+    def __init__(self, pioneer: PioneerAVR, window: float) -> None:
+        """Initialize the Pioneer AVR query batcher."""
+        self.pioneer = pioneer
+        self.window = window
+        self.stats = {
+            "requested": 0,  ## queries requested by callers
+            "sent": 0,  ## queries sent to the AVR
+            "batched": 0,  ## requests merged into a pending batch
+            "shared": 0,  ## requests sharing a query already in flight
+        }
+        self._pending: dict[QueryKey, asyncio.Future] = {}
+        self._in_flight: dict[QueryKey, asyncio.Future] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    @property
+    def deduplicated(self) -> int:
+        """Return number of requests that did not result in an AVR query."""
+        return self.stats["batched"] + self.stats["shared"]
+
+    async def query(self, command: str, *args, zone: Zone = Zone.Z1) -> Any:
+        """Request an AVR query and wait for the result of the batched query."""
+        key = (command, args, zone)
+        self.stats["requested"] += 1
+        if (future := self._in_flight.get(key)) is not None:
+            self.stats["shared"] += 1
+        elif (future := self._pending.get(key)) is not None:
+            self.stats["batched"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            ## Mark exception as retrieved in case all waiters are cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            if self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.window, self._start_flush)
+        return await asyncio.shield(future)
+
+    def _start_flush(self) -> None:
+        """Start sending queries collected during the batch window."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        self._in_flight.update(pending)
+        flush_task = asyncio.create_task(
+            self._flush(pending), name="pioneer_async_query_batch"
+        )
+        self._flush_tasks.add(flush_task)
+        flush_task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, pending: dict[QueryKey, asyncio.Future]) -> None:
+        """Send each distinct query once and complete all waiters."""
+        _LOGGER.debug(">> query batch: %s", list(pending))
+        try:
+            for key, future in pending.items():
+                command, args, zone = key
+                try:
+                    self.stats["sent"] += 1
+                    result = await self.pioneer.send_command(command, *args, zone=zone)
+                except Exception as exc:  # pylint: disable=broad-except
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                finally:
+                    if self._in_flight.get(key) is future:
+                        del self._in_flight[key]
+        finally:
+            for key, future in pending.items():
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+                if not future.done():  ## batch cancelled
+                    future.cancel()
+
+    async def shutdown(self) -> None:
+        """Cancel pending and in progress queries."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for flush_task in self._flush_tasks:
+            flush_task.cancel()
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
@@ -0,0 +1,679 @@
+"""Pioneer AVR refresh management."""
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
+
+from aiopioneer.command_queue import CommandItem
+from aiopioneer.const import Zone
+from aiopioneer.decoders.audio import SpeakerChannel
+from aiopioneer.exceptions import AVRUnavailableError
+from aiopioneer.params import (
+    PARAM_ALWAYS_POLL,
+    PARAM_DISABLE_AUTO_QUERY,
+    PARAM_ENABLED_FUNCTIONS,
+    DEFAULT_ENABLED_FUNCTIONS,
+)
+from aiopioneer.properties import AVRProperties
+from aiopioneer.property_registry import PROPERTY_REGISTRY
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import (
+    PioneerData,
+    DATA_REFRESH_PLANNER,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL_IDLE,
+    CONF_SCAN_INTERVAL_ACTIVE,
+    CONF_SELECTIVE_REFRESH,
+    CONF_REFRESH_SCHEDULER,
+    CONF_REFRESH_STALE_ONLY,
+    CONF_HEARTBEAT,
+    CONF_HEARTBEAT_REFRESH_COUNT,
+    ADAPTIVE_ACTIVE_PERIOD,
+    REFRESH_GROUPS_ALWAYS,
+    REFRESH_SCHEDULE,
+    REFRESH_SCHEDULER_INTERVAL,
+    REFRESH_CONDITION_ZONE_ON,
+    REFRESH_CONDITION_SOURCE_TUNER,
+    REFRESH_DEPENDENCIES,
+    REFRESH_DEPENDENCY_GLOBAL_TRIGGERS,
+    ZONE_HYDRATION_TIERS,
+    ZONE_HYDRATION_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_INTERVAL_MODE_IDLE = "idle"  ## all zones off
+SCAN_INTERVAL_MODE_ON = "on"  ## one or more zones on
+SCAN_INTERVAL_MODE_ACTIVE = "active"  ## zone recently changed
+
+REFRESH_CONDITIONS: dict[str, Callable[[AVRProperties, Zone], bool]] = {
+    REFRESH_CONDITION_ZONE_ON: lambda properties, zone: bool(
+        properties.power.get(zone)
+    ),
+    REFRESH_CONDITION_SOURCE_TUNER: lambda properties, zone: (
+        bool(properties.power.get(zone)) and properties.is_source_tuner()
+    ),
+}
+
+
+def get_refresh_group(query_command: str) -> str | None:
+    """Return the AVR property group refreshed by a query command."""
+    for group in DEFAULT_ENABLED_FUNCTIONS:
+        if query_command.startswith(f"query_{group}"):
+            return group
+    return None
+
+
+def get_property_value(properties: AVRProperties, property_key: str, zone: Zone) -> Any:
+    """Return current value of an AVR property (base_property[.property_name])."""
+    base_property, _, property_name = property_key.partition(".")
+    value = getattr(properties, base_property, None)
+    if isinstance(value, dict) and (
+        zone in value or (value and all(isinstance(k, Zone) for k in value))
+    ):
+        value = value.get(zone)
+    if property_name:
+        value = value.get(property_name) if isinstance(value, dict) else None
+    return value
+
+
+def get_query_args(
+    query_command: str, zone: Zone, properties: AVRProperties
+) -> list[tuple]:
+    """Return the arguments of each query needed to refresh a query command.
+
+    Returns a single empty argument list for query commands without
+    arguments, and an empty list if the arguments cannot be determined.
+    """
+    if query_command == "query_channel_level":
+        channels = properties.channel_level.get(zone) or SpeakerChannel.CHANNELS_ALL
+        return [(channel,) for channel in channels]
+    command = PROPERTY_REGISTRY.command_index.get(query_command)
+    if command is not None and command.avr_args:
+        return []
+    return [()]
+
+
+def get_group_query_items(
+    group: str, zone: Zone, properties: AVRProperties, queue_id: int = 2
+) -> list[CommandItem]:
+    """Return command queue items to refresh an AVR property group for a zone.
+
+    The group may also be a query command name without the query_ prefix.
+    """
+    items = []
+    commands = list(PROPERTY_REGISTRY.get_commands(prefix=f"query_{group}", zone=zone))
+    if exact_commands := [c for c in commands if c.name == f"query_{group}"]:
+        commands = exact_commands
+    for command in commands:
+        for args in get_query_args(command.name, zone, properties):
+            items.append(
+                CommandItem(
+                    command.name,
+                    *args,
+                    zone=zone,
+                    ignore_error=True,
+                    rate_limit=False,
+                    skip_if_queued=False,
+                    queue_id=queue_id,
+                )
+            )
+    return items
+
+
+class PioneerRefreshManager:
+    """Manage AVR refresh behaviour for a Pioneer AVR config entry."""
+
+    def __init__(self, hass: HomeAssistant, pioneer_data: PioneerData) -> None:
+        """Initialize the Pioneer AVR refresh manager."""
+        self.hass = hass
+        self.pioneer_data = pioneer_data
+        self.pioneer = pioneer_data.pioneer
+        self.options = pioneer_data.options
+        self.scan_interval_mode: str | None = None
+        self._zone_state: dict[Zone, tuple] = {}
+        self._active_cancel: CALLBACK_TYPE | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._enabled_functions: list[str] = list(
+            self.pioneer.params.get_param(PARAM_ENABLED_FUNCTIONS, [])
+        )
+        self._entity_groups: Counter[str] = Counter()
+        self._started = False
+        self.next_due: dict[str, datetime] = {}
+        self._schedule_listeners: list[Callable[[], None]] = []
+        self._trigger_values: dict[tuple[str, Zone], Any] = {}
+        self._heartbeat_count = 0
+        self._heartbeat_responses: dict[Zone, str | None] | None = None
+        self._heartbeat_updated: float | None = None
+        self._refresh_updated: float | None = None
+        self.scan_interval: int | None = None
+        self.refresh_phase: float | None = None  ## fraction of scan interval
+        self._refresh_cancel: CALLBACK_TYPE | None = None
+
+    @property
+    def adaptive_scan_interval(self) -> bool:
+        """Return whether the scan interval adapts to AVR activity."""
+        return bool(self.options.get(CONF_ADAPTIVE_SCAN_INTERVAL))
+
+    @property
+    def selective_refresh(self) -> bool:
+        """Return whether only property groups used by entities are refreshed."""
+        return bool(self.options.get(CONF_SELECTIVE_REFRESH))
+
+    @property
+    def refresh_scheduler(self) -> bool:
+        """Return whether property groups are refreshed on individual schedules."""
+        return bool(self.options.get(CONF_REFRESH_SCHEDULER))
+
+    @property
+    def refresh_stale_only(self) -> bool:
+        """Return whether the refresh scheduler queries only stale properties."""
+        return bool(self.options.get(CONF_REFRESH_STALE_ONLY))
+
+    @property
+    def heartbeat(self) -> bool:
+        """Return whether a heartbeat query replaces the full refresh."""
+        return bool(self.options.get(CONF_HEARTBEAT))
+
+    @property
+    def refresh_groups(self) -> set[str]:
+        """Return AVR property groups to be refreshed."""
+        if not self.selective_refresh:
+            return set(self._enabled_functions)
+        return set(self._enabled_functions) & (
+            set(REFRESH_GROUPS_ALWAYS) | set(+self._entity_groups)
+        )
+
+    def start(self) -> None:
+        """Start monitoring zone updates."""
+        self._started = True
+        self._update_enabled_functions()
+        for zone, coordinator in self.pioneer_data.coordinators.items():
+            if zone is not Zone.ALL:
+                self._zone_state[zone] = self._get_zone_state(zone)
+                coordinator.set_power_on_callback(partial(self.hydrate_zone, zone))
+            self._update_trigger_values(zone)
+            self._listeners.append(
+                coordinator.async_add_listener(partial(self._handle_zone_update, zone))
+            )
+        self._update_scan_interval()
+        if self.refresh_scheduler:
+            self._listeners.append(
+                async_track_time_interval(
+                    self.hass,
+                    self._handle_scheduler_interval,
+                    timedelta(seconds=REFRESH_SCHEDULER_INTERVAL),
+                    name="pioneer_async_refresh_scheduler",
+                )
+            )
+
+    def stop(self) -> None:
+        """Stop monitoring zone updates."""
+        self._started = False
+        for coordinator in self.pioneer_data.coordinators.values():
+            coordinator.set_power_on_callback(None)
+        for remove_listener in self._listeners:
+            remove_listener()
+        self._listeners = []
+        if self._active_cancel is not None:
+            self._active_cancel()
+            self._active_cancel = None
+        self._cancel_refresh_timer()
+
+    @callback
+    def add_entity_groups(self, groups: Iterable[str]) -> None:
+        """Register AVR property groups used by an entity."""
+        refresh_groups = self.refresh_groups
+        self._entity_groups.update(groups)
+        if not self._started:
+            return
+        if new_groups := self.refresh_groups - refresh_groups:
+            ## Refresh newly used groups now rather than at the next refresh
+            self._update_enabled_functions()
+            self.enqueue_group_queries(new_groups)
+
+    @callback
+    def remove_entity_groups(self, groups: Iterable[str]) -> None:
+        """Unregister AVR property groups used by an entity."""
+        self._entity_groups.subtract(groups)
+        if self._started:
+            self._update_enabled_functions()
+
+    def _update_enabled_functions(self) -> None:
+        """Set AVR property groups queried by the updater on full refresh."""
+        if self.refresh_scheduler:
+            ## Property groups are queried by the refresh scheduler instead
+            enabled_functions = [
+                f for f in self._enabled_functions if f not in REFRESH_SCHEDULE
+            ]
+        elif self.selective_refresh:
+            refresh_groups = self.refresh_groups
+            enabled_functions = [
+                f for f in self._enabled_functions if f in refresh_groups
+            ]
+        else:
+            return
+        if enabled_functions == self.pioneer.params.get_param(PARAM_ENABLED_FUNCTIONS):
+            return
+        _LOGGER.debug("refreshing property groups: %s", enabled_functions)
+        self.pioneer.params.set_user_param(PARAM_ENABLED_FUNCTIONS, enabled_functions)
+
+    def enqueue_group_queries(
+        self,
+        groups: Iterable[str],
+        zones: Iterable[Zone] = None,
+        queue_id: int = 2,
+        max_age: float = None,
+    ) -> None:
+        """Queue queries for AVR property groups on powered zones.
+
+        If max_age is specified, then only properties that have not been
+        updated by the AVR within max_age seconds are queried.
+        """
+        properties = self.pioneer.properties
+        if zones is None:
+            zones = properties.zones
+        items = []
+        for zone in zones:
+            if not properties.power.get(zone):
+                continue
+            for group in groups:
+                for item in get_group_query_items(group, zone, properties, queue_id):
+                    if max_age is not None:
+                        age = self.pioneer.get_query_age(item.command, zone, *item.args)
+                        if age is not None and age < max_age:
+                            continue
+                    items.append(item)
+        if items:
+            self.pioneer.properties.command_queue.extend(items)
+
+    @callback
+    def hydrate_zone(self, zone: Zone) -> None:
+        """Query zone properties in priority order when the zone is turned on."""
+        properties = self.pioneer.properties
+        if zone not in properties.zones_initial_refresh:
+            return  ## initial refresh for zone is queued by aiopioneer
+        refresh_groups = self.refresh_groups
+        _LOGGER.debug("hydrating zone %s", zone)
+
+        ## Wait until AVR is ready to respond to queries, as aiopioneer does
+        ## before refreshing a zone after power on
+        properties.command_queue.enqueue(
+            CommandItem("_sleep", ZONE_HYDRATION_DELAY, queue_id=1)
+        )
+        for tier, queries in enumerate(ZONE_HYDRATION_TIERS):
+            if tier > 0 and self.pioneer.params.get_param(PARAM_DISABLE_AUTO_QUERY):
+                break
+            queries = [
+                query
+                for query in queries
+                if (group := get_refresh_group(f"query_{query}")) is None
+                or group in refresh_groups
+            ]
+            self.enqueue_group_queries(
+                queries, zones=[zone], queue_id=1 if tier == 0 else 2
+            )
+
+    @callback
+    def async_add_schedule_listener(
+        self, update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Add listener for refresh schedule updates."""
+        self._schedule_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._schedule_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _handle_scheduler_interval(self, now: datetime) -> None:
+        """Queue queries for property groups that are due for refresh."""
+        if not self.pioneer.available:
+            return
+        properties = self.pioneer.properties
+        refresh_groups = self.refresh_groups
+        updated = False
+        for group, (interval, condition) in REFRESH_SCHEDULE.items():
+            if group not in refresh_groups:
+                if self.next_due.pop(group, None) is not None:
+                    updated = True
+                continue
+            if group not in self.next_due:
+                ## Property groups were queried on initial refresh
+                self.next_due[group] = now + timedelta(seconds=interval)
+                updated = True
+                continue
+            if self.next_due[group] > now:
+                continue
+            zones = [
+                zone
+                for zone in properties.zones
+                if REFRESH_CONDITIONS[condition](properties, zone)
+            ]
+            if not zones:
+                continue  ## query when condition is next met
+            _LOGGER.debug("refreshing property group %s for zones %s", group, zones)
+            max_age = None
+            if self.refresh_stale_only:
+                max_age = interval - REFRESH_SCHEDULER_INTERVAL
+            self.enqueue_group_queries([group], zones=zones, max_age=max_age)
+            self.next_due[group] = now + timedelta(seconds=interval)
+            updated = True
+        if updated:
+            for update_callback in self._schedule_listeners:
+                update_callback()
+
+    def get_group_freshness(self) -> dict[str, dict[str, Any]]:
+        """Return age of the oldest property and stale property count per group."""
+        freshness: dict[str, dict[str, Any]] = {}
+        for query_command, zone, args in self.pioneer.query_updated:
+            if (group := get_refresh_group(query_command)) is None:
+                continue
+            age = self.pioneer.get_query_age(query_command, zone, *args)
+            group_freshness = freshness.setdefault(group, {"oldest": 0, "stale": 0})
+            group_freshness["oldest"] = round(max(group_freshness["oldest"], age))
+            if group in REFRESH_SCHEDULE and age > REFRESH_SCHEDULE[group][0]:
+                group_freshness["stale"] += 1
+        return freshness
+
+    def _get_zone_state(self, zone: Zone) -> tuple[Any, ...]:
+        """Return zone properties that indicate AVR activity when changed."""
+        properties = self.pioneer.properties
+        return (
+            properties.power.get(zone),
+            properties.volume.get(zone),
+            properties.mute.get(zone),
+            properties.source_id.get(zone),
+        )
+
+    @callback
+    def _handle_zone_update(self, zone: Zone) -> None:
+        """Handle zone coordinator update."""
+        if zone is not Zone.ALL:
+            zone_state = self._get_zone_state(zone)
+            if zone_state != self._zone_state.get(zone):
+                self._zone_state[zone] = zone_state
+                self.notify_activity()
+        self._update_trigger_values(zone)
+
+    def _update_trigger_values(self, zone: Zone) -> None:
+        """Queue queries for properties that depend on changed trigger properties."""
+        properties = self.pioneer.properties
+        dependent_queries: dict[Zone, set[str]] = {}
+        for trigger, dependents in REFRESH_DEPENDENCIES.items():
+            if trigger in REFRESH_DEPENDENCY_GLOBAL_TRIGGERS:
+                trigger_zone, query_zone = Zone.ALL, Zone.Z1
+            elif zone is Zone.ALL:
+                continue
+            else:
+                trigger_zone = query_zone = zone
+            value = get_property_value(properties, trigger, trigger_zone)
+            key = (trigger, trigger_zone)
+            if key in self._trigger_values and value != self._trigger_values[key]:
+                _LOGGER.debug(
+                    "%s changed for zone %s, querying %s", trigger, zone, dependents
+                )
+                dependent_queries.setdefault(query_zone, set()).update(dependents)
+            self._trigger_values[key] = value
+
+        if not self._started or self.pioneer.params.get_param(PARAM_DISABLE_AUTO_QUERY):
+            return
+        for query_zone, queries in dependent_queries.items():
+            queries = [
+                query
+                for query in queries
+                if (group := get_refresh_group(f"query_{query}")) is None
+                or group in self._enabled_functions
+            ]
+            self.enqueue_group_queries(queries, zones=[query_zone])
+
+    @callback
+    def notify_activity(self) -> None:
+        """Switch to the active scan interval for a period after AVR activity."""
+        if not self.adaptive_scan_interval:
+            return
+        if self._active_cancel is not None:
+            self._active_cancel()
+        self._active_cancel = async_call_later(
+            self.hass, ADAPTIVE_ACTIVE_PERIOD, self._handle_active_expired
+        )
+        self._update_scan_interval()
+
+    @callback
+    def _handle_active_expired(self, _now) -> None:
+        """Handle end of active period."""
+        self._active_cancel = None
+        self._update_scan_interval()
+
+    @callback
+    def _update_scan_interval(self) -> None:
+        """Set AVR scan interval if the scan interval mode has changed."""
+        if not self.adaptive_scan_interval:
+            self._set_scan_interval(self.options[CONF_SCAN_INTERVAL])
+            return
+        if self._active_cancel is not None:
+            mode = SCAN_INTERVAL_MODE_ACTIVE
+        elif any(self.pioneer.properties.power.values()):
+            mode = SCAN_INTERVAL_MODE_ON
+        else:
+            mode = SCAN_INTERVAL_MODE_IDLE
+        if mode == self.scan_interval_mode:
+            return
+
+        self.scan_interval_mode = mode
+        scan_interval = {
+            SCAN_INTERVAL_MODE_IDLE: self.options[CONF_SCAN_INTERVAL_IDLE],
+            SCAN_INTERVAL_MODE_ON: self.options[CONF_SCAN_INTERVAL],
+            SCAN_INTERVAL_MODE_ACTIVE: self.options[CONF_SCAN_INTERVAL_ACTIVE],
+        }[mode]
+        _LOGGER.debug("setting %s scan interval: %ss", mode, scan_interval)
+        self._set_scan_interval(scan_interval)
+
+    @callback
+    def _set_scan_interval(self, scan_interval: int) -> None:
+        """Set AVR scan interval, or heartbeat interval if heartbeat is enabled."""
+        self.scan_interval = scan_interval
+        self._cancel_refresh_timer()
+        if self.heartbeat:
+            ## Full refreshes are triggered by the heartbeat instead of the updater
+            self._start_refresh_timer(scan_interval, self._handle_heartbeat)
+            scan_interval = 0
+        elif self.refresh_phase is not None and scan_interval:
+            ## Full refreshes are scheduled by the refresh planner phase
+            self._start_refresh_timer(scan_interval, self._handle_refresh_interval)
+            scan_interval = 0
+        self.hass.async_create_background_task(
+            self.pioneer.set_scan_interval(scan_interval),
+            name="pioneer_async_set_scan_interval",
+        )
+
+    @callback
+    def set_refresh_phase(self, refresh_phase: float | None) -> None:
+        """Set the phase of full refreshes, or None to use the AVR updater."""
+        if refresh_phase == self.refresh_phase:
+            return
+        self.refresh_phase = refresh_phase
+        if self._started and self.scan_interval is not None:
+            self._set_scan_interval(self.scan_interval)
+
+    @callback
+    def _start_refresh_timer(
+        self, scan_interval: int, action: Callable[[datetime], None]
+    ) -> None:
+        """Start a full refresh or heartbeat every scan interval.
+
+        The first action is at the refresh phase of the scan interval if one
+        has been assigned by the refresh planner, otherwise after one scan
+        interval.
+        """
+        if not scan_interval:
+            return
+        delay = scan_interval
+        if self.refresh_phase is not None:
+            delay = (self.refresh_phase * scan_interval - time.time()) % scan_interval
+
+        @callback
+        def _handle_refresh_phase(now: datetime) -> None:
+            self._refresh_cancel = async_track_time_interval(
+                self.hass,
+                action,
+                timedelta(seconds=scan_interval),
+                name="pioneer_async_refresh",
+            )
+            action(now)
+
+        _LOGGER.debug(
+            "scheduling %s every %ss starting in %.1fs",
+            action.__name__,
+            scan_interval,
+            delay,
+        )
+        self._refresh_cancel = async_call_later(self.hass, delay, _handle_refresh_phase)
+
+    @callback
+    def _cancel_refresh_timer(self) -> None:
+        """Cancel full refreshes scheduled by the refresh phase."""
+        if self._refresh_cancel is not None:
+            self._refresh_cancel()
+            self._refresh_cancel = None
+
+    @callback
+    def _handle_refresh_interval(self, _now: datetime) -> None:
+        """Handle refresh interval."""
+        if not self.pioneer.available:
+            return
+        self.hass.async_create_background_task(
+            self._async_refresh(), name="pioneer_async_refresh"
+        )
+
+    async def _async_refresh(self) -> None:
+        """Perform a full refresh if the AVR has not responded since the last.
+
+        As with the aiopioneer updater, any AVR response (including keepalive
+        responses) since the previous refresh interval is treated as a
+        refresh, unless the AVR is always polled.
+        """
+        pioneer = self.pioneer
+        if (
+            not pioneer.params.get_param(PARAM_ALWAYS_POLL)
+            and pioneer.last_updated != self._refresh_updated
+        ):
+            ## AVR has responded since the last refresh interval
+            self._refresh_updated = pioneer.last_updated
+            return
+        try:
+            await pioneer.refresh(wait=True)
+        except AVRUnavailableError:
+            return
+        ## Responses to the full refresh are not treated as AVR activity
+        self._refresh_updated = pioneer.last_updated
+
+    @callback
+    def _handle_heartbeat(self, _now: datetime) -> None:
+        """Handle heartbeat interval."""
+        if not self.pioneer.available:
+            return
+        self.hass.async_create_background_task(
+            self._async_heartbeat(), name="pioneer_async_heartbeat"
+        )
+
+    async def _async_heartbeat(self) -> None:
+        """Confirm AVR connection with power queries and refresh if required.
+
+        The power state of each zone is queried, and a full refresh is
+        performed only if a power query fails or its response changes, or
+        after the configured number of heartbeats.
+        """
+        pioneer = self.pioneer
+        if pioneer.params.get_param(PARAM_ALWAYS_POLL):
+            reason = "always poll"
+        elif pioneer.last_updated != self._heartbeat_updated:
+            ## AVR has responded since the last heartbeat
+            self._heartbeat_updated = pioneer.last_updated
+            return
+        else:
+            responses = {}
+            try:
+                for zone in sorted(pioneer.properties.zones):
+                    responses[zone] = await pioneer.send_command(
+                        "query_power", zone=zone, ignore_error=True
+                    )
+            except AVRUnavailableError:
+                return
+            self._heartbeat_count += 1
+            self._heartbeat_updated = pioneer.last_updated
+            previous_responses, self._heartbeat_responses = (
+                self._heartbeat_responses,
+                responses,
+            )
+            if None in responses.values():
+                reason = "no response"
+            elif previous_responses is not None and responses != previous_responses:
+                reason = "power changed"
+            elif self._heartbeat_count >= self.options[CONF_HEARTBEAT_REFRESH_COUNT]:
+                reason = "heartbeat count"
+            else:
+                return
+        _LOGGER.debug("heartbeat triggered full refresh: %s", reason)
+        self._heartbeat_count = 0
+        await pioneer.refresh(wait=False)
+
+
+class PioneerRefreshPlanner:
+    """Spread full refreshes of Pioneer AVR config entries across the scan interval.
+
+    Each registered config entry is assigned an evenly spaced phase within its
+    scan interval, and its refresh manager schedules full refreshes (or
+    heartbeats) at that phase instead of the aiopioneer updater, whose
+    schedule follows the time of the last AVR response.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the Pioneer AVR refresh planner."""
+        self.hass = hass
+        self.entries: dict[str, PioneerRefreshManager] = {}
+
+    @callback
+    def register(
+        self, entry_id: str, refresh_manager: PioneerRefreshManager
+    ) -> CALLBACK_TYPE:
+        """Add refresh manager of config entry to the refresh plan."""
+        self.entries[entry_id] = refresh_manager
+        self._replan()
+
+        @callback
+        def unregister() -> None:
+            self.entries.pop(entry_id, None)
+            self._replan()
+
+        return unregister
+
+    @callback
+    def _replan(self) -> None:
+        """Assign an evenly spaced refresh phase to each config entry."""
+        if len(self.entries) < 2:
+            for refresh_manager in self.entries.values():
+                refresh_manager.set_refresh_phase(None)
+            return
+        for index, entry_id in enumerate(sorted(self.entries)):
+            refresh_phase = index / len(self.entries)
+            _LOGGER.debug("refresh phase for %s: %.2f", entry_id, refresh_phase)
+            self.entries[entry_id].set_refresh_phase(refresh_phase)
+
+
+@callback
+def async_get_refresh_planner(hass: HomeAssistant) -> PioneerRefreshPlanner:
+    """Return the integration-wide refresh planner."""
+    if (planner := hass.data.get(DATA_REFRESH_PLANNER)) is None:
+        planner = hass.data[DATA_REFRESH_PLANNER] = PioneerRefreshPlanner(hass)
+    return planner
@@ -25,11 +25,13 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, PioneerData
 from .entity_base import PioneerEntityBase, PioneerTunerEntity
+from .timing import timed_platform_setup
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@timed_platform_setup("select")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -133,7 +135,9 @@ class PioneerGenericSelect(PioneerSelect):
 
     async def async_update(self) -> None:
         """Refresh the AVR property."""
-        await self.pioneer_command(self.property_entry.query_command.name)
+        await self.pioneer_command(
+            self.property_entry.query_command.name, zone=self.command_zone
+        )
 
 
 class TunerPresetSelect(PioneerTunerEntity, PioneerGenericSelect):
@@ -3,29 +3,34 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Any, Callable
 
 from aiopioneer.const import Zone
+from aiopioneer.params import PARAM_COMMAND_DELAY
 
 from homeassistant.components.sensor import (
-    # SensorDeviceClass,
+    SensorDeviceClass,
     SensorEntity,
-    # SensorStateClass,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, MATCH_ALL, PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import select_dict, reject_dict
-from .const import DOMAIN, PioneerData
+from .const import DOMAIN, COMMAND_LATENCY_PERCENTILES, PioneerData
 from .entity_base import PioneerEntityBase
+from .refresh import get_refresh_group
+from .timing import timed_platform_setup
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@timed_platform_setup("sensor")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -101,8 +106,18 @@ async def async_setup_entry(
                     "parental_lock_password",
                 ],
             ),
+            PioneerQueryStatisticsSensor(pioneer_data),
+            PioneerPropertyFreshnessSensor(pioneer_data),
+            PioneerCommandDelaySensor(pioneer_data),
+            *[
+                PioneerCommandLatencySensor(pioneer_data, percentile=p)
+                for p in COMMAND_LATENCY_PERCENTILES
+            ],
+            PioneerCommandErrorRateSensor(pioneer_data),
         ]
     )
+    if pioneer_data.refresh_manager.refresh_scheduler:
+        entities.append(PioneerRefreshScheduleSensor(pioneer_data))
 
     ## Add zone specific sensor entities
     for zone in pioneer.properties.zones:
@@ -174,6 +189,15 @@ class PioneerGenericSensor(PioneerSensor):
         ):
             self.exclude_properties.append(promoted_property)
 
+    @property
+    def refresh_groups(self) -> set[str]:
+        """Return AVR property groups that the sensor uses."""
+        if self.promoted_property == "display":
+            return {"display"}
+        if group := get_refresh_group(f"query_{self.base_property}"):
+            return {group}
+        return set()
+
     @property
     def native_value(self) -> str:
         """Retrieve sensor value."""
@@ -204,3 +228,170 @@ class PioneerGenericSensor(PioneerSensor):
         if self.exclude_properties:
             return reject_dict(attrs, self.exclude_properties)
         return attrs
+
+
+class PioneerQueryStatisticsSensor(PioneerSensor):
+    """Pioneer AVR query deduplication statistics sensor."""
+
+    _attr_name = "Query Deduplication"
+    _attr_icon = "mdi:call-merge"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    available_on_zones_off = True
+
+    @property
+    def native_value(self) -> int:
+        """Return number of queries that were not sent to the AVR."""
+        return self.pioneer_data.query_batcher.deduplicated
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return query counters and deduplication hit rate."""
+        query_batcher = self.pioneer_data.query_batcher
+        stats = query_batcher.stats
+        hit_rate = None
+        if stats["requested"]:
+            hit_rate = round(query_batcher.deduplicated / stats["requested"], 3)
+        return stats | {"hit_rate": hit_rate}
+
+
+class PioneerRefreshScheduleSensor(PioneerSensor):
+    """Pioneer AVR refresh schedule sensor."""
+
+    _attr_name = "Refresh Schedule"
+    _attr_icon = "mdi:calendar-clock"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_registry_enabled_default = False
+
+    available_on_zones_off = True
+
+    async def async_added_to_hass(self) -> None:
+        """Update sensor when the refresh schedule changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.pioneer_data.refresh_manager.async_add_schedule_listener(
+                self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return time that the next property group is due for refresh."""
+        return min(self.pioneer_data.refresh_manager.next_due.values(), default=None)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return time that each property group is next due for refresh."""
+        return {
+            group: next_due.isoformat()
+            for group, next_due in self.pioneer_data.refresh_manager.next_due.items()
+        }
+
+
+class PioneerPropertyFreshnessSensor(PioneerSensor):
+    """Pioneer AVR property freshness sensor."""
+
+    _attr_name = "Stale Properties"
+    _attr_icon = "mdi:timer-sand"
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    available_on_zones_off = True
+
+    @property
+    def native_value(self) -> int:
+        """Return number of properties not updated within their group max age."""
+        freshness = self.pioneer_data.refresh_manager.get_group_freshness()
+        return sum(group["stale"] for group in freshness.values())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return age of the oldest property and stale property count per group."""
+        return self.pioneer_data.refresh_manager.get_group_freshness()
+
+
+class PioneerCommandDelaySensor(PioneerSensor):
+    """Pioneer AVR effective command delay sensor."""
+
+    _attr_name = "Command Delay"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    available_on_zones_off = True
+
+    @property
+    def native_value(self) -> float:
+        """Return current delay between commands sent to the AVR."""
+        return self.pioneer.params.get_param(PARAM_COMMAND_DELAY)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return adaptive command pacing statistics."""
+        if (command_pacer := self.pioneer.command_pacer) is None:
+            return None
+        latency = command_pacer.latency
+        return command_pacer.stats | {
+            "latency": round(latency, 3) if latency is not None else None,
+            "delay_min": command_pacer.delay_min,
+            "delay_max": command_pacer.delay_max,
+        }
+
+
+class PioneerCommandLatencySensor(PioneerSensor):
+    """Pioneer AVR command response latency percentile sensor."""
+
+    _attr_icon = "mdi:timer-sand-complete"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    available_on_zones_off = True
+
+    def __init__(self, pioneer_data: PioneerData, percentile: int) -> None:
+        """Initialize the Pioneer AVR command latency sensor."""
+        self._attr_name = f"Command Latency P{percentile}"
+        self.percentile = percentile
+        super().__init__(pioneer_data)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return response latency percentile for all commands."""
+        return self.pioneer.command_stats.total.response.percentile(self.percentile)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return queue wait and response latency percentile per command type."""
+        command_stats = self.pioneer.command_stats
+        return {
+            "queue_wait": command_stats.total.queue_wait.percentile(self.percentile),
+            "commands": {
+                command: stats.response.percentile(self.percentile)
+                for command, stats in command_stats.commands.items()
+                if stats.response.count
+            },
+        }
+
+
+class PioneerCommandErrorRateSensor(PioneerSensor):
+    """Pioneer AVR command error rate sensor."""
+
+    _attr_name = "Command Error Rate"
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+
+    available_on_zones_off = True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return percentage of commands that timed out or found the AVR busy."""
+        if (error_rate := self.pioneer.command_stats.total.error_rate) is None:
+            return None
+        return round(error_rate * 100, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return command, response, timeout, error and retry counters."""
+        return self.pioneer.command_stats.total.stats
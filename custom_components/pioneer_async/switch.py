@@ -21,11 +21,13 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, PioneerData
 from .entity_base import PioneerEntityBase
+from .timing import timed_platform_setup
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@timed_platform_setup("switch")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -116,7 +118,9 @@ class PioneerGenericSwitch(PioneerSwitch):
 
     async def async_update(self) -> None:
         """Refresh the AVR property."""
-        await self.pioneer_command(self.property_entry.query_command.name)
+        await self.pioneer_command(
+            self.property_entry.query_command.name, zone=self.command_zone
+        )
 
 
 class PhaseControlPlusAutoSwitch(PioneerGenericSwitch):
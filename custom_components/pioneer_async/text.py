@@ -20,11 +20,13 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, PioneerData
 from .entity_base import PioneerEntityBase
+from .timing import timed_platform_setup
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@timed_platform_setup("text")
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -113,4 +115,6 @@ class PioneerGenericText(PioneerText):
 
     async def async_update(self) -> None:
         """Refresh the AVR property."""
-        await self.pioneer_command(self.property_entry.query_command.name)
+        await self.pioneer_command(
+            self.property_entry.query_command.name, zone=self.command_zone
+        )
@@ -0,0 +1,227 @@
+"""Pioneer AVR setup phase and hot path timing."""
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+import functools
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, DATA_SETUP_TIMERS, HOTPATH_TIMING_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+PHASE_MIGRATE = "migrate"
+PHASE_SETUP = "setup"
+PHASE_PLATFORMS = "platforms"
+PERCENTILES = [50, 95, 99]
+
+
+class PioneerSetupTimer:
+    """Record the duration of config entry setup phases.
+
+    Phases are identified by their path of nested phase names, so that phases
+    running concurrently (such as platform setup) can be recorded without
+    tracking a phase stack. Durations are wall clock time, and include time
+    spent waiting for the AVR and for other tasks.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the Pioneer AVR setup timer."""
+        self.phases: dict[tuple[str, ...], float] = {}  ## phase path: seconds
+        self._setup_start: float | None = None
+
+    def start_setup(self) -> None:
+        """Start timing config entry setup."""
+        self.phases[(PHASE_SETUP,)] = 0.0
+        self._setup_start = time.perf_counter()
+
+    def finish_setup(self) -> None:
+        """Finish timing config entry setup and log the phase breakdown."""
+        if self._setup_start is None:
+            return
+        self.phases[(PHASE_SETUP,)] = time.perf_counter() - self._setup_start
+        self._setup_start = None
+        _LOGGER.debug("setup phase breakdown:\n%s", self.format_tree())
+
+    @contextmanager
+    def phase(self, *path: str) -> Iterator[None]:
+        """Time a setup phase."""
+        self.phases.setdefault(path, 0.0)  ## order phases by start time
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[path] += time.perf_counter() - start
+
+    def get_children(self, path: tuple[str, ...]) -> list[tuple[str, ...]]:
+        """Return paths of the child phases of a phase in start order."""
+        return [p for p in self.phases if len(p) == len(path) + 1 and p[:-1] == path]
+
+    def walk(self, path: tuple[str, ...] = ()) -> Iterator[tuple[str, ...]]:
+        """Iterate over phase paths depth first in start order."""
+        for child in self.get_children(path):
+            yield child
+            yield from self.walk(child)
+
+    def get_self_time(self, path: tuple[str, ...]) -> float:
+        """Return time spent in a phase excluding its child phases."""
+        children = sum(self.phases[p] for p in self.get_children(path))
+        return max(self.phases[path] - children, 0.0)
+
+    def as_folded(self) -> list[str]:
+        """Return phase self times in microseconds in folded stack format."""
+        return [
+            f"{';'.join(path)} {round(self.get_self_time(path) * 1e6)}"
+            for path in self.walk()
+        ]
+
+    def as_dict(self) -> dict[str, float]:
+        """Return phase durations in milliseconds keyed by phase path."""
+        return {
+            "/".join(path): round(self.phases[path] * 1000, 3) for path in self.walk()
+        }
+
+    def format_tree(self) -> str:
+        """Return phase durations as an indented flame-style breakdown."""
+        total = sum(self.phases[p] for p in self.get_children(()))
+        lines = []
+        for path in self.walk():
+            duration = self.phases[path]
+            share = duration / total if total else 0.0
+            name = "  " * (len(path) - 1) + path[-1]
+            lines.append(
+                f"{name:<32} {duration * 1000:9.1f}ms {share:6.1%} "
+                f"{'#' * round(share * 40)}"
+            )
+        return "\n".join(lines)
+
+
+class PioneerHotPathTimer:
+    """Keep rolling percentiles of hot path durations and warn on slow callbacks.
+
+    Callbacks and entity state writes run on the event loop, so their duration
+    is time that the event loop is blocked, and a warning is logged when it
+    exceeds the threshold. AVR commands are awaited, so their duration
+    includes time waiting for the AVR and is not checked against the
+    threshold.
+    """
+
+    def __init__(self, threshold: float, window: int = HOTPATH_TIMING_WINDOW) -> None:
+        """Initialize the Pioneer AVR hot path timer."""
+        self.threshold = threshold  ## seconds
+        self.window = window
+        self.durations: dict[str, deque[float]] = {}
+        self.calls: dict[str, int] = {}
+        self.slow_calls: dict[str, int] = {}
+
+    @contextmanager
+    def measure(
+        self, name: str, check_slow: bool = True, **context: Any
+    ) -> Iterator[None]:
+        """Time a hot path."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, check_slow, context)
+
+    def wrap(self, func: Callable[..., Any], name: str, **context: Any) -> Callable:
+        """Return a callback that times func as a hot path."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            with self.measure(name, **context):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def record(
+        self,
+        name: str,
+        duration: float,
+        check_slow: bool = True,
+        context: dict[str, Any] | None = None,
+    ) -> None:
+        """Record the duration of a hot path."""
+        if (durations := self.durations.get(name)) is None:
+            durations = self.durations[name] = deque(maxlen=self.window)
+        durations.append(duration)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if not check_slow or duration <= self.threshold:
+            return
+        self.slow_calls[name] = self.slow_calls.get(name, 0) + 1
+        stats = self.get_stats(name)
+        _LOGGER.warning(
+            "%s blocked the event loop for %.1fms (threshold %.0fms, "
+            "p50 %.1fms, p95 %.1fms over last %d calls)%s",
+            name,
+            duration * 1000,
+            self.threshold * 1000,
+            stats["p50"],
+            stats["p95"],
+            len(durations),
+            "".join(f", {k}={v}" for k, v in (context or {}).items()),
+        )
+
+    def get_stats(self, name: str) -> dict[str, float]:
+        """Return rolling percentiles in milliseconds for a hot path."""
+        durations = sorted(self.durations.get(name, []))
+        if not durations:
+            return {}
+        stats = {
+            f"p{p}": round(durations[(len(durations) - 1) * p // 100] * 1000, 3)
+            for p in PERCENTILES
+        }
+        return {
+            "calls": self.calls[name],
+            "slow_calls": self.slow_calls.get(name, 0),
+            **stats,
+            "max": round(durations[-1] * 1000, 3),
+        }
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return rolling percentiles in milliseconds for all hot paths."""
+        return {name: self.get_stats(name) for name in self.durations}
+
+
+@callback
+def async_get_setup_timer(hass: HomeAssistant, entry_id: str) -> PioneerSetupTimer:
+    """Return the setup timer for a config entry being set up."""
+    timers = hass.data.setdefault(DATA_SETUP_TIMERS, {})
+    if (timer := timers.get(entry_id)) is None:
+        timer = timers[entry_id] = PioneerSetupTimer()
+    return timer
+
+
+@callback
+def async_pop_setup_timer(hass: HomeAssistant, entry_id: str) -> PioneerSetupTimer:
+    """Return and release the setup timer for a config entry."""
+    timer = async_get_setup_timer(hass, entry_id)
+    hass.data[DATA_SETUP_TIMERS].pop(entry_id)
+    return timer
+
+
+def timed_platform_setup(
+    platform: str,
+) -> Callable[[Callable[..., Awaitable[None]]], Callable[..., Awaitable[None]]]:
+    """Decorate a platform async_setup_entry to record its setup time."""
+
+    def decorator(
+        func: Callable[..., Awaitable[None]],
+    ) -> Callable[..., Awaitable[None]]:
+        @functools.wraps(func)
+        async def wrapper(
+            hass: HomeAssistant, config_entry: ConfigEntry, *args, **kwargs
+        ) -> None:
+            timer = hass.data[DOMAIN][config_entry.entry_id].setup_timer
+            with timer.phase(PHASE_SETUP, PHASE_PLATFORMS, platform):
+                return await func(hass, config_entry, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
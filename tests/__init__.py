@@ -0,0 +1 @@
+"""Tests for the Pioneer AVR integration."""
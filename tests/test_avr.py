@@ -0,0 +1,42 @@
+"""Tests for Pioneer AVR property freshness tracking."""
+
+from aiopioneer.const import Zone
+from aiopioneer.property_registry import PROPERTY_REGISTRY
+
+from custom_components.pioneer_async.avr import (
+    RESPONSE_PREFIX_LENGTHS,
+    RESPONSE_QUERIES,
+    PioneerHassAVR,
+)
+
+
+def test_response_queries_match_registry() -> None:
+    """Response prefix lookup matches the same prefix as the registry scan."""
+    for response_cmd in RESPONSE_QUERIES:
+        raw = response_cmd + "000"
+        prefix = next(
+            raw[:n] for n in RESPONSE_PREFIX_LENGTHS if raw[:n] in RESPONSE_QUERIES
+        )
+        assert prefix == PROPERTY_REGISTRY.match_response(raw)[0] == response_cmd
+
+
+def test_query_updated_before_zone_callback() -> None:
+    """Zone callbacks see the update time of the response being decoded."""
+    avr = PioneerHassAVR("localhost")
+    avr.properties.zones.add(Zone.Z1)
+    ages = []
+    avr.set_zone_callback(
+        Zone.Z1, lambda: ages.append(avr.get_query_age("query_volume", Zone.Z1))
+    )
+    avr.decode_response("VOL121")
+    assert avr.properties.volume[Zone.Z1] == 121
+    assert ages and ages[0] is not None and ages[0] < 1
+
+
+def test_channel_level_updated_per_channel() -> None:
+    """A channel level response refreshes only the channel it reports."""
+    avr = PioneerHassAVR("localhost")
+    avr.decode_response("CLVL__50")
+    assert avr.get_query_age("query_channel_level", Zone.Z1, "L") is not None
+    assert avr.get_query_age("query_channel_level", Zone.Z1, "C") is None
+    assert avr.get_query_age("query_channel_level", Zone.Z1) is None
@@ -0,0 +1,131 @@
+"""Tests for Pioneer AVR command latency statistics."""
+
+import asyncio
+
+from custom_components.pioneer_async.latency import (
+    COMMAND_TOTAL,
+    PioneerCommandStats,
+    PioneerLatencyHistogram,
+)
+
+
+def test_histogram_empty() -> None:
+    """An empty histogram has no percentiles or mean."""
+    histogram = PioneerLatencyHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.as_dict()["mean"] is None
+
+
+def test_histogram_buckets() -> None:
+    """Latencies are counted in the first bucket with an upper bound not below it."""
+    histogram = PioneerLatencyHistogram([1, 10, 100])
+    for latency in [0.5, 1, 5, 10, 50, 500]:
+        histogram.record(latency)
+    assert histogram.counts == [2, 2, 1, 1]
+    assert histogram.as_dict()["buckets"] == {
+        "<=1": 2,
+        "<=10": 2,
+        "<=100": 1,
+        ">100": 1,
+    }
+    assert histogram.max == 500
+
+
+def test_histogram_percentile_interpolated() -> None:
+    """Percentiles are interpolated within the bucket containing the rank."""
+    histogram = PioneerLatencyHistogram([10, 20, 30])
+    for latency in [5] * 5 + [15] * 5:
+        histogram.record(latency)
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(75) == 12.5
+    assert histogram.percentile(100) == 15
+
+
+def test_histogram_percentile_capped_at_maximum() -> None:
+    """Percentiles do not exceed the maximum recorded latency."""
+    histogram = PioneerLatencyHistogram([1, 2, 5])
+    for _ in range(10):
+        histogram.record(3)
+    assert histogram.percentile(50) == 2.5
+    assert histogram.percentile(99) <= 3
+    histogram.record(100)
+    assert histogram.percentile(100) == 100
+
+
+def test_command_stats_records_command() -> None:
+    """A sent command records queue wait, response latency and counters."""
+
+    async def run() -> PioneerCommandStats:
+        command_stats = PioneerCommandStats()
+        token = command_stats.start("query_power")
+        command_stats.record_sent()
+        command_stats.record_error(busy=True)
+        command_stats.record_sent()  ## retry
+        command_stats.record_response()
+        command_stats.finish(token)
+        return command_stats
+
+    stats = asyncio.run(run()).as_dict()
+    for command_stats in [stats[COMMAND_TOTAL], stats["commands"]["query_power"]]:
+        assert command_stats["commands"] == 1
+        assert command_stats["retries"] == 1
+        assert command_stats["busy"] == 1
+        assert command_stats["responses"] == 1
+        assert command_stats["error_rate"] == 1.0
+        assert command_stats["queue_wait_ms"]["count"] == 1
+        assert command_stats["response_ms"]["count"] == 1
+
+
+def test_command_stats_ignores_unsent_command() -> None:
+    """A command that is never sent to the AVR is not counted."""
+
+    async def run() -> PioneerCommandStats:
+        command_stats = PioneerCommandStats()
+        command_stats.finish(command_stats.start("_full_refresh"))
+        return command_stats
+
+    stats = asyncio.run(run()).as_dict()
+    assert stats[COMMAND_TOTAL]["commands"] == 0
+    assert stats[COMMAND_TOTAL]["error_rate"] is None
+
+
+def test_command_stats_ignores_child_tasks() -> None:
+    """Tasks created while a command is in progress do not record its timing."""
+
+    async def run() -> PioneerCommandStats:
+        command_stats = PioneerCommandStats()
+        token = command_stats.start("power_on")
+        await asyncio.create_task(_record_sent(command_stats))
+        command_stats.finish(token)
+        return command_stats
+
+    assert asyncio.run(run()).as_dict()[COMMAND_TOTAL]["commands"] == 0
+
+
+async def _record_sent(command_stats: PioneerCommandStats) -> None:
+    command_stats.record_sent()
+
+
+def test_command_stats_concurrent_commands() -> None:
+    """Concurrent commands are timed independently."""
+
+    async def send(command_stats: PioneerCommandStats, command: str) -> None:
+        token = command_stats.start(command)
+        await asyncio.sleep(0)
+        command_stats.record_sent()
+        await asyncio.sleep(0)
+        command_stats.record_error(timeout=True)
+        command_stats.finish(token)
+
+    async def run() -> PioneerCommandStats:
+        command_stats = PioneerCommandStats()
+        await asyncio.gather(
+            send(command_stats, "volume_up"), send(command_stats, "volume_down")
+        )
+        return command_stats
+
+    stats = asyncio.run(run()).as_dict()
+    assert stats[COMMAND_TOTAL]["commands"] == 2
+    assert stats[COMMAND_TOTAL]["timeouts"] == 2
+    assert stats["commands"]["volume_up"]["timeouts"] == 1
+    assert stats["commands"]["volume_down"]["timeouts"] == 1
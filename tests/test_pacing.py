@@ -0,0 +1,112 @@
+"""Tests for Pioneer AVR adaptive command pacing."""
+
+import pytest
+
+from aiopioneer.params import AVRParams, PARAM_COMMAND_DELAY
+
+from custom_components.pioneer_async.const import (
+    COMMAND_PACING_DECREASE,
+    COMMAND_PACING_INCREASE_FACTOR,
+    COMMAND_PACING_INCREASE_MIN,
+    COMMAND_PACING_APPLY_DECREASE,
+)
+from custom_components.pioneer_async.pacing import PioneerCommandPacer
+
+
+def get_pacer(
+    delay: float = 0.1, delay_min: float = 0.0, delay_max: float = 1.0
+) -> PioneerCommandPacer:
+    """Return a command pacer with an initial command delay."""
+    return PioneerCommandPacer(
+        AVRParams({PARAM_COMMAND_DELAY: delay}), delay_min, delay_max
+    )
+
+
+def test_response_decreases_delay() -> None:
+    """Each timely response decreases the delay additively."""
+    pacer = get_pacer(delay=0.1)
+    pacer.record_response(0.05)
+    pacer.record_response(0.05)
+    assert pacer.delay == pytest.approx(0.1 - 2 * COMMAND_PACING_DECREASE)
+    assert pacer.stats["responses"] == 2
+
+
+def test_decrease_applied_in_steps() -> None:
+    """A decreased delay is applied to the AVR params only in larger steps."""
+    pacer = get_pacer(delay=0.2)
+    pacer.record_response(0.05)
+    assert pacer.params.get_param(PARAM_COMMAND_DELAY) == 0.2
+    while pacer.delay > 0.2 - COMMAND_PACING_APPLY_DECREASE:
+        pacer.record_response(0.05)
+    assert pacer.params.get_param(PARAM_COMMAND_DELAY) == pacer.delay
+
+
+def test_decrease_to_minimum_applied() -> None:
+    """A delay decreased to the minimum is applied to the AVR params."""
+    pacer = get_pacer(delay=0.1, delay_min=0.09)
+    pacer.record_response(0.05)
+    assert pacer.params.get_param(PARAM_COMMAND_DELAY) == 0.09
+
+
+def test_increase_applied() -> None:
+    """An increased delay is applied to the AVR params immediately."""
+    pacer = get_pacer(delay=0.1)
+    pacer.record_response(0.05)
+    pacer.record_error()
+    assert pacer.params.get_param(PARAM_COMMAND_DELAY) == pacer.delay
+
+
+def test_delay_not_decreased_below_minimum() -> None:
+    """The delay does not decrease below the configured minimum."""
+    pacer = get_pacer(delay=0.1, delay_min=0.08)
+    for _ in range(10):
+        pacer.record_response(0.05)
+    assert pacer.delay == 0.08
+
+
+def test_error_increases_delay() -> None:
+    """A timeout or busy response increases the delay multiplicatively."""
+    pacer = get_pacer(delay=0.1)
+    pacer.record_error(timeout=True)
+    assert pacer.delay == pytest.approx(0.1 * COMMAND_PACING_INCREASE_FACTOR)
+    pacer.record_error()
+    assert pacer.delay == pytest.approx(0.1 * COMMAND_PACING_INCREASE_FACTOR**2)
+    assert pacer.stats["timeouts"] == 1
+    assert pacer.stats["errors"] == 1
+
+
+def test_error_increases_zero_delay() -> None:
+    """The delay increases by at least the minimum increase from zero."""
+    pacer = get_pacer(delay=0.0)
+    pacer.record_error()
+    assert pacer.delay == COMMAND_PACING_INCREASE_MIN
+
+
+def test_delay_not_increased_above_maximum() -> None:
+    """The delay does not increase above the configured maximum."""
+    pacer = get_pacer(delay=0.1, delay_max=0.3)
+    for _ in range(5):
+        pacer.record_error(timeout=True)
+    assert pacer.delay == 0.3
+
+
+def test_slow_response_increases_delay() -> None:
+    """A response much slower than the smoothed latency increases the delay."""
+    pacer = get_pacer(delay=0.1)
+    pacer.record_response(0.1)
+    pacer.record_response(2.0)
+    assert pacer.stats["slow"] == 1
+    assert pacer.delay == pytest.approx(
+        (0.1 - COMMAND_PACING_DECREASE) * COMMAND_PACING_INCREASE_FACTOR
+    )
+
+
+def test_initial_delay_within_bounds() -> None:
+    """The initial delay is limited to the configured bounds."""
+    pacer = get_pacer(delay=2.0, delay_max=0.5)
+    assert pacer.delay == 0.5
+    assert pacer.params.get_param(PARAM_COMMAND_DELAY) == 0.5
+    assert get_pacer(delay=0.0, delay_min=0.05).delay == 0.05
+    pacer = get_pacer(delay=0.1, delay_min=0.2, delay_max=0.1)
+    assert pacer.delay_max == 0.2
+    assert pacer.delay == 0.2
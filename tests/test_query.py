@@ -0,0 +1,146 @@
+"""Tests for Pioneer AVR query batching and deduplication."""
+
+import asyncio
+
+import pytest
+
+from aiopioneer.const import Zone
+from aiopioneer.exceptions import AVRResponseTimeoutError
+
+from custom_components.pioneer_async.query import PioneerQueryBatcher
+
+WINDOW = 0.01
+
+
+class FakeAVR:
+    """AVR that records queries and returns a response for each."""
+
+    def __init__(self, exc: Exception | None = None) -> None:
+        self.queries: list[tuple] = []
+        self.exc = exc
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def send_command(self, command: str, *args, zone: Zone = Zone.Z1) -> str:
+        self.queries.append((command, args, zone))
+        await self.release.wait()
+        if self.exc is not None:
+            raise self.exc
+        return f"{command}{''.join(map(str, args))}:{zone}"
+
+
+def test_batch_deduplicates_queries() -> None:
+    """Identical queries within the batch window are sent once."""
+
+    async def run() -> tuple[PioneerQueryBatcher, FakeAVR, list]:
+        avr = FakeAVR()
+        batcher = PioneerQueryBatcher(avr, WINDOW)
+        results = await asyncio.gather(
+            batcher.query("query_volume", zone=Zone.Z1),
+            batcher.query("query_volume", zone=Zone.Z1),
+            batcher.query("query_volume", zone=Zone.Z2),
+            batcher.query("query_volume", zone=Zone.Z1),
+        )
+        return batcher, avr, results
+
+    batcher, avr, results = asyncio.run(run())
+    assert avr.queries == [("query_volume", (), Zone.Z1), ("query_volume", (), Zone.Z2)]
+    assert results == [
+        "query_volume:1",
+        "query_volume:1",
+        "query_volume:2",
+        "query_volume:1",
+    ]
+    assert batcher.stats == {"requested": 4, "sent": 2, "batched": 2, "shared": 0}
+    assert batcher.deduplicated == 2
+
+
+def test_batch_distinguishes_arguments() -> None:
+    """Queries with different arguments are sent separately."""
+
+    async def run() -> FakeAVR:
+        avr = FakeAVR()
+        batcher = PioneerQueryBatcher(avr, WINDOW)
+        await asyncio.gather(
+            batcher.query("query_channel_level", "L__"),
+            batcher.query("query_channel_level", "R__"),
+            batcher.query("query_channel_level", "L__"),
+        )
+        return avr
+
+    avr = asyncio.run(run())
+    assert [q[1] for q in avr.queries] == [("L__",), ("R__",)]
+
+
+def test_query_shares_in_flight_query() -> None:
+    """A query requested while an identical query is in flight shares its result."""
+
+    async def run() -> tuple[PioneerQueryBatcher, FakeAVR, list]:
+        avr = FakeAVR()
+        avr.release.clear()
+        batcher = PioneerQueryBatcher(avr, WINDOW)
+        first = asyncio.create_task(batcher.query("query_power"))
+        while not avr.queries:  ## wait for batch to be sent
+            await asyncio.sleep(WINDOW)
+        second = asyncio.create_task(batcher.query("query_power"))
+        await asyncio.sleep(0)
+        avr.release.set()
+        return batcher, avr, await asyncio.gather(first, second)
+
+    batcher, avr, results = asyncio.run(run())
+    assert len(avr.queries) == 1
+    assert results == ["query_power:1", "query_power:1"]
+    assert batcher.stats["shared"] == 1
+
+
+def test_query_error_propagates_to_all_waiters() -> None:
+    """A failed query raises its exception for every waiter and is not cached."""
+
+    async def run() -> tuple[FakeAVR, list, str]:
+        avr = FakeAVR(exc=AVRResponseTimeoutError(command="query_power"))
+        batcher = PioneerQueryBatcher(avr, WINDOW)
+        results = await asyncio.gather(
+            batcher.query("query_power"),
+            batcher.query("query_power"),
+            return_exceptions=True,
+        )
+        avr.exc = None
+        return avr, results, await batcher.query("query_power")
+
+    avr, results, retry = asyncio.run(run())
+    assert all(isinstance(r, AVRResponseTimeoutError) for r in results)
+    assert len(avr.queries) == 2
+    assert retry == "query_power:1"
+
+
+def test_cancelled_waiter_does_not_cancel_query() -> None:
+    """Cancelling one waiter leaves the query running for other waiters."""
+
+    async def run() -> tuple[FakeAVR, str]:
+        avr = FakeAVR()
+        batcher = PioneerQueryBatcher(avr, WINDOW)
+        cancelled = asyncio.create_task(batcher.query("query_mute"))
+        waiter = asyncio.create_task(batcher.query("query_mute"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return avr, await waiter
+
+    avr, result = asyncio.run(run())
+    assert result == "query_mute:1"
+    assert len(avr.queries) == 1
+
+
+def test_shutdown_cancels_pending_queries() -> None:
+    """Queries waiting for the batch window are cancelled on shutdown."""
+
+    async def run() -> FakeAVR:
+        avr = FakeAVR()
+        batcher = PioneerQueryBatcher(avr, WINDOW)
+        waiter = asyncio.create_task(batcher.query("query_power"))
+        await asyncio.sleep(0)
+        await batcher.shutdown()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return avr
+
+    assert not asyncio.run(run()).queries
@@ -0,0 +1,94 @@
+"""Tests for Pioneer AVR refresh management."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from aiopioneer.const import Zone
+from aiopioneer.params import AVRParams, PARAM_ALWAYS_POLL
+from aiopioneer.properties import AVRProperties
+
+from custom_components.pioneer_async.refresh import PioneerRefreshManager
+
+
+class FakeAVR:
+    """AVR that records full refreshes and can send keepalive responses."""
+
+    def __init__(self, params: dict | None = None) -> None:
+        self.params = AVRParams(params)
+        self.available = True
+        self.last_updated = time.time()  ## responses to initial refresh
+        self.refreshes = 0
+
+    def keepalive(self) -> None:
+        """Receive a keepalive response from the AVR."""
+        self.last_updated += 1
+
+    async def refresh(self, wait: bool = True) -> None:
+        """Perform a full refresh, receiving responses from the AVR."""
+        self.refreshes += 1
+        self.last_updated += 1
+
+
+def get_refresh_manager(pioneer: FakeAVR) -> PioneerRefreshManager:
+    """Return a refresh manager for an AVR."""
+    pioneer_data = SimpleNamespace(pioneer=pioneer, options={}, coordinators={})
+    return PioneerRefreshManager(None, pioneer_data)
+
+
+def test_planned_refresh_skipped_on_keepalive() -> None:
+    """No full refresh is performed while the AVR sends keepalive responses."""
+    pioneer = FakeAVR()
+    refresh_manager = get_refresh_manager(pioneer)
+
+    async def run() -> None:
+        for _ in range(5):
+            pioneer.keepalive()
+            await refresh_manager._async_refresh()
+
+    asyncio.run(run())
+    assert pioneer.refreshes == 0
+
+
+def test_planned_refresh_when_avr_idle() -> None:
+    """A full refresh is performed every interval while the AVR is idle."""
+    pioneer = FakeAVR()
+    refresh_manager = get_refresh_manager(pioneer)
+
+    async def run() -> None:
+        await refresh_manager._async_refresh()  ## responses since setup
+        for _ in range(3):
+            await refresh_manager._async_refresh()
+
+    asyncio.run(run())
+    assert pioneer.refreshes == 3
+
+
+def test_planned_refresh_always_poll() -> None:
+    """A full refresh is performed every interval if the AVR is always polled."""
+    pioneer = FakeAVR({PARAM_ALWAYS_POLL: True})
+    refresh_manager = get_refresh_manager(pioneer)
+
+    async def run() -> None:
+        for _ in range(3):
+            pioneer.keepalive()
+            await refresh_manager._async_refresh()
+
+    asyncio.run(run())
+    assert pioneer.refreshes == 3
+
+
+def test_hydrate_zone_waits_for_power_on() -> None:
+    """Zone hydration waits for the AVR to be ready before querying the zone."""
+    pioneer = FakeAVR()
+    pioneer.properties = AVRProperties(pioneer.params)
+    pioneer.properties.zones_initial_refresh.add(Zone.Z1)
+    pioneer.properties.power[Zone.Z1] = True
+    refresh_manager = get_refresh_manager(pioneer)
+    command_queue = pioneer.properties.command_queue
+    command_queue.schedule = lambda: None  ## inspect queue without executing
+
+    refresh_manager.hydrate_zone(Zone.Z1)
+    commands = command_queue.commands
+    assert commands[0] == "_sleep"
+    assert commands[1:4] == ["query_volume", "query_mute", "query_source"]
@@ -0,0 +1,461 @@
+"""Pioneer AVR protocol simulator.
+
+Runs an asyncio TCP server that speaks the Pioneer AVR telnet command/response
+protocol used by aiopioneer, so that the integration can be exercised without
+a physical receiver.
+
+usage: python tools/avr_simulator.py [--port 8102] [--zones 1,2] [--script FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "VSX-930"
+DEFAULT_SOURCES = {
+    "04": "DVD",
+    "25": "BD",
+    "05": "SAT/CBL",
+    "01": "CD",
+    "02": "TUNER",
+    "26": "NETWORK",
+}
+DEFAULT_KEEPALIVE_INTERVAL = 30
+UNKNOWN_COMMAND_RESPONSE = "E04"
+INVALID_PARAMETER_RESPONSE = "E06"
+
+
+@dataclass
+class ZoneProtocol:
+    """AVR commands and responses for a zone."""
+
+    power_query: str
+    power_response: str
+    power_on: str
+    power_off: str
+    volume_query: str
+    volume_response: str
+    volume_set: str
+    volume_up: str
+    volume_down: str
+    volume_digits: int
+    volume_max: int
+    mute_query: str
+    mute_response: str
+    mute_on: str
+    mute_off: str
+    source_query: str
+    source_response: str
+    source_set: str
+
+
+ZONE_PROTOCOLS = {
+    "1": ZoneProtocol(
+        *("?P", "PWR", "PO", "PF"),
+        *("?V", "VOL", "VL", "VU", "VD", 3, 185),
+        *("?M", "MUT", "MO", "MF"),
+        *("?F", "FN", "FN"),
+    ),
+    "2": ZoneProtocol(
+        *("?AP", "APR", "APO", "APF"),
+        *("?ZV", "ZV", "ZV", "ZU", "ZD", 2, 81),
+        *("?Z2M", "Z2MUT", "Z2MO", "Z2MF"),
+        *("?ZS", "Z2F", "ZS"),
+    ),
+    "3": ZoneProtocol(
+        *("?BP", "BPR", "BPO", "BPF"),
+        *("?YV", "YV", "YV", "YU", "YD", 2, 81),
+        *("?Z3M", "Z3MUT", "Z3MO", "Z3MF"),
+        *("?ZT", "Z3F", "ZT"),
+    ),
+    "Z": ZoneProtocol(
+        *("?ZEP", "ZEP", "ZEO", "ZEF"),
+        *("?HZV", "XV", "HZV", "HZU", "HZD", 2, 81),
+        *("?HZM", "HZMUT", "HZMO", "HZMF"),
+        *("?ZEA", "ZEA", "ZEA"),
+    ),
+}
+
+STATIC_RESPONSES = {  ## global query: response
+    "?S": "SR0101",
+    "?L": "LM0101",
+    "?TO": "TO1",
+    "?BA": "BA06",
+    "?TR": "TR06",
+    "?MC": "MC1",
+    "?IS": "IS1",
+    "?SPK": "SPK1",
+    "?HO": "HO0",
+    "?PQ": "PQ0",
+    "?SAB": "SAB000",
+    "?SAC": "SAC0",
+}
+
+
+@dataclass
+class ZoneState:
+    """Simulated AVR zone state."""
+
+    power: bool = False
+    volume: int = 0
+    mute: bool = False
+    source: str = "25"
+
+
+@dataclass
+class AVRState:
+    """Simulated AVR state."""
+
+    model: str = DEFAULT_MODEL
+    sources: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_SOURCES))
+    zones: dict[str, ZoneState] = field(default_factory=dict)
+    display: str = ""
+
+
+def encode_display(text: str) -> str:
+    """Encode display text as an AVR FL response."""
+    text = text[:14].ljust(14)
+    return "FL02" + "".join(f"{ord(c):02X}" for c in text)
+
+
+class AVRSimulator:
+    """Simulated Pioneer AVR that accepts aiopioneer connections."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        zones: list[str] | None = None,
+        sources: dict[str, str] | None = None,
+        model: str = DEFAULT_MODEL,
+        keepalive_interval: float = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        drop_rate: float = 0,
+        script: list[dict[str, Any]] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the AVR simulator.
+
+        latency and jitter are in seconds, drop_rate is the probability that
+        a response to a command is not sent.
+        """
+        self.host = host
+        self.port = port
+        self.state = AVRState(model=model)
+        if sources is not None:
+            self.state.sources = {f"{int(k):02d}": v for k, v in sources.items()}
+        for zone in zones or ["1"]:
+            if zone not in ZONE_PROTOCOLS:
+                raise ValueError(f"unknown zone {zone}")
+            volume = 81 if zone == "1" else 41
+            self.state.zones[zone] = ZoneState(volume=volume)
+        self.keepalive_interval = keepalive_interval
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.script = script or []
+        self.stats = {"connections": 0, "commands": 0, "responses": 0, "dropped": 0}
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._client_connected = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._handlers = self._build_handlers()
+
+    async def start(self) -> None:
+        """Start listening for AVR connections."""
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOGGER.info("AVR simulator listening on %s:%d", self.host, self.port)
+        if self.keepalive_interval:
+            self._create_task(self._keepalive())
+        if self.script:
+            self._create_task(self.run_script(self.script))
+
+    async def stop(self) -> None:
+        """Stop the simulator and close all connections."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> AVRSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _create_task(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle commands received from a client connection."""
+        self.stats["connections"] += 1
+        self._clients.add(writer)
+        self._client_connected.set()
+        try:
+            while command := await reader.readuntil(b"\r"):
+                command = command.decode("ASCII").strip()
+                if not command:
+                    continue
+                self.stats["commands"] += 1
+                _LOGGER.debug("received command: %s", command)
+                response, broadcast = self.handle_command(command)
+                if response is None:
+                    continue
+                await self._delay_response()
+                if self.drop_rate and self._random.random() < self.drop_rate:
+                    self.stats["dropped"] += 1
+                    continue
+                if broadcast:
+                    self.send_response(response)
+                else:
+                    self._write(writer, response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def wait_for_client(self) -> None:
+        """Wait until a client has connected to the simulator."""
+        await self._client_connected.wait()
+
+    async def _delay_response(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _write(self, writer: asyncio.StreamWriter, response: str) -> None:
+        if writer.is_closing():
+            return
+        if response:
+            self.stats["responses"] += 1
+            _LOGGER.debug("sending response: %s", response)
+        writer.write(response.encode("ASCII") + b"\r\n")
+
+    def send_response(self, response: str) -> None:
+        """Send an unsolicited response to all connected clients."""
+        for writer in list(self._clients):
+            self._write(writer, response)
+
+    async def _keepalive(self) -> None:
+        """Send empty keepalive responses, as AVRs do on port 8102."""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            self.send_response("")
+
+    async def run_script(self, script: list[dict[str, Any]]) -> None:
+        """Apply scripted unsolicited updates.
+
+        Each step waits for delay seconds, then applies one of: command (as if
+        sent via the AVR front panel or remote, eg. VU for the volume knob),
+        display (front panel display text) or response (raw response).
+        A step with repeat set is applied that many times.
+        """
+        for step in script:
+            for _ in range(step.get("repeat", 1)):
+                await asyncio.sleep(step.get("delay", 0))
+                if "command" in step:
+                    response, _ = self.handle_command(step["command"])
+                    if response:
+                        self.send_response(response)
+                elif "display" in step:
+                    self.state.display = step["display"]
+                    self.send_response(encode_display(self.state.display))
+                elif "response" in step:
+                    self.send_response(step["response"])
+
+    ## Command handling
+    def handle_command(self, command: str) -> tuple[str | None, bool]:
+        """Apply a command to the AVR state.
+
+        Return the response and whether it is sent to all clients.
+        """
+        for pattern, handler in self._handlers:
+            if match := pattern.fullmatch(command):
+                return handler(*match.groups())
+        if command in STATIC_RESPONSES:
+            return STATIC_RESPONSES[command], False
+        if command == "?RGD":
+            return f"RGD<{self.state.model}>", False
+        if command == "?FL":
+            return encode_display(self.state.display), False
+        if match := re.fullmatch(r"\?RGB(\d{2})", command):
+            if (name := self.state.sources.get(match.group(1))) is None:
+                return INVALID_PARAMETER_RESPONSE, False
+            return f"RGB{match.group(1)}1{name}", False
+        return UNKNOWN_COMMAND_RESPONSE, False
+
+    def _build_handlers(self) -> list[tuple[re.Pattern, Callable]]:
+        handlers = []
+        for zone in self.state.zones:
+            protocol = ZONE_PROTOCOLS[zone]
+            state = self.state.zones[zone]
+            handlers.extend(
+                [
+                    (protocol.power_query, self._zone_power(state, protocol, None)),
+                    (protocol.power_on, self._zone_power(state, protocol, True)),
+                    (protocol.power_off, self._zone_power(state, protocol, False)),
+                    (protocol.volume_query, self._zone_volume(state, protocol, None)),
+                    (protocol.volume_up, self._zone_volume(state, protocol, 1)),
+                    (protocol.volume_down, self._zone_volume(state, protocol, -1)),
+                    (
+                        rf"(\d{{{protocol.volume_digits}}}){protocol.volume_set}",
+                        self._zone_volume(state, protocol, 0),
+                    ),
+                    (protocol.mute_query, self._zone_mute(state, protocol, None)),
+                    (protocol.mute_on, self._zone_mute(state, protocol, True)),
+                    (protocol.mute_off, self._zone_mute(state, protocol, False)),
+                    (protocol.source_query, self._zone_source(state, protocol)),
+                    (
+                        rf"(\d{{2}}){protocol.source_set}",
+                        self._zone_source(state, protocol),
+                    ),
+                ]
+            )
+        return [
+            (re.compile(re.escape(p) if "(" not in p else p), h) for p, h in handlers
+        ]
+
+    @staticmethod
+    def _zone_power(state: ZoneState, protocol: ZoneProtocol, power: bool | None):
+        def handler():
+            broadcast = power is not None and power != state.power
+            if power is not None:
+                state.power = power
+            return f"{protocol.power_response}{0 if state.power else 1}", broadcast
+
+        return handler
+
+    @staticmethod
+    def _zone_volume(state: ZoneState, protocol: ZoneProtocol, step: int | None):
+        def handler(volume: str = None):
+            broadcast = step is not None
+            if volume is not None:
+                state.volume = min(int(volume), protocol.volume_max)
+            elif step:
+                state.volume = min(max(state.volume + step, 0), protocol.volume_max)
+            volume_code = str(state.volume).zfill(protocol.volume_digits)
+            return f"{protocol.volume_response}{volume_code}", broadcast
+
+        return handler
+
+    @staticmethod
+    def _zone_mute(state: ZoneState, protocol: ZoneProtocol, mute: bool | None):
+        def handler():
+            broadcast = mute is not None and mute != state.mute
+            if mute is not None:
+                state.mute = mute
+            return f"{protocol.mute_response}{0 if state.mute else 1}", broadcast
+
+        return handler
+
+    def _zone_source(self, state: ZoneState, protocol: ZoneProtocol):
+        def handler(source: str = None):
+            if source is not None:
+                if source not in self.state.sources:
+                    return INVALID_PARAMETER_RESPONSE, False
+                state.source = source
+            return f"{protocol.source_response}{state.source}", source is not None
+
+        return handler
+
+
+def parse_sources(value: str) -> dict[str, str]:
+    """Parse sources specified as id=name,id=name."""
+    sources = {}
+    for item in value.split(","):
+        source_id, _, name = item.partition("=")
+        sources[source_id.strip()] = name.strip()
+    return sources
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    """Return argument parser for simulator options."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8102)
+    parser.add_argument("--zones", default="1", help="comma separated, eg. 1,2,3,Z")
+    parser.add_argument("--sources", type=parse_sources, help="eg. 25=BD,04=DVD")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--keepalive",
+        type=float,
+        default=DEFAULT_KEEPALIVE_INTERVAL,
+        help="seconds between keepalive responses, 0 to disable (port 23 AVRs)",
+    )
+    parser.add_argument("--latency", type=float, default=0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="seconds")
+    parser.add_argument("--drop-rate", type=float, default=0, help="0.0 to 1.0")
+    parser.add_argument("--script", help="JSON file of scripted updates")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--debug", action="store_true")
+    return parser
+
+
+def get_simulator(args: argparse.Namespace) -> AVRSimulator:
+    """Return simulator configured from parsed arguments."""
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as script_file:
+            script = json.load(script_file)
+    return AVRSimulator(
+        host=args.host,
+        port=args.port,
+        zones=args.zones.split(","),
+        sources=args.sources,
+        model=args.model,
+        keepalive_interval=args.keepalive,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        script=script,
+        seed=args.seed,
+    )
+
+
+async def main() -> None:
+    """Run the AVR simulator until interrupted."""
+    args = get_argument_parser().parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    simulator = get_simulator(args)
+    await simulator.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,206 @@
+"""End-to-end latency and throughput benchmark for the Pioneer AVR integration.
+
+Sets up the integration with async_setup_entry in a Home Assistant test
+instance against the AVR simulator, and reports setup time, AVR response to
+state write latency, state writes per AVR message, CPU time per 1000 updates
+and action round-trip latency as JSON.
+
+usage: python tools/benchmark.py [--zones 1 --zones 1,2,3] [--entities default,all]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+from typing import Any
+
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED, __version__
+from homeassistant.core import Event, HomeAssistant
+
+from avr_simulator import AVRSimulator
+from ha_harness import (
+    async_test_instance,
+    add_pioneer_entry,
+    get_zone_entity_id,
+    async_enable_all_entities,
+)
+
+from custom_components.pioneer_async.const import VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_TIMEOUT = 5  ## seconds to wait for a state write after an AVR message
+
+
+def summarise(samples: list[float]) -> dict[str, float]:
+    """Return summary statistics in milliseconds for samples in seconds."""
+    samples_ms = sorted(s * 1000 for s in samples)
+    if not samples_ms:
+        return {}
+    quantiles = statistics.quantiles(samples_ms, n=20) if len(samples_ms) > 1 else []
+    return {
+        "count": len(samples_ms),
+        "mean": round(statistics.fmean(samples_ms), 3),
+        "p50": round(statistics.median(samples_ms), 3),
+        "p95": round(quantiles[18], 3) if quantiles else samples_ms[0],
+        "max": round(samples_ms[-1], 3),
+    }
+
+
+class StateWriteMonitor:
+    """Count state writes and signal state writes for an entity."""
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        self.entity_id = entity_id
+        self.writes = 0
+        self.updated = asyncio.Event()
+        self._remove = hass.bus.async_listen(EVENT_STATE_CHANGED, self._handle_event)
+
+    def _handle_event(self, event: Event) -> None:
+        self.writes += 1
+        if event.data.get(ATTR_ENTITY_ID) == self.entity_id:
+            self.updated.set()
+
+    def remove(self) -> None:
+        self._remove()
+
+
+async def async_send_updates(
+    hass: HomeAssistant,
+    simulator: AVRSimulator,
+    monitor: StateWriteMonitor,
+    count: int,
+) -> list[float]:
+    """Send unsolicited volume changes and return latency to state write."""
+    latencies = []
+    for index in range(count):
+        command = "VU" if index % 2 == 0 else "VD"
+        response, _ = simulator.handle_command(command)
+        monitor.updated.clear()
+        start = time.perf_counter()
+        simulator.send_response(response)
+        async with asyncio.timeout(UPDATE_TIMEOUT):
+            await monitor.updated.wait()
+        latencies.append(time.perf_counter() - start)
+        await hass.async_block_till_done()
+    return latencies
+
+
+async def async_run_scenario(
+    zones: list[str], entities: str, samples: int, updates: int, calls: int
+) -> dict[str, Any]:
+    """Run benchmark scenario and return results."""
+    async with AVRSimulator(zones=zones) as simulator, async_test_instance() as hass:
+        simulator.handle_command("PO")  ## Zone 1 on so that entities are available
+        entry = add_pioneer_entry(hass, simulator)
+
+        start = time.perf_counter()
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError("config entry setup failed")
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - start
+
+        if entities != "default":
+            limit = None if entities == "all" else int(entities)
+            await async_enable_all_entities(hass, entry, limit=limit)
+        enabled_entities = len(hass.states.async_all())
+        entity_id = get_zone_entity_id(hass, entry)
+
+        ## AVR response to state write latency, and state writes per message
+        monitor = StateWriteMonitor(hass, entity_id)
+        latencies = await async_send_updates(hass, simulator, monitor, samples)
+        writes_per_message = monitor.writes / samples
+
+        ## CPU time per 1000 updates
+        cpu_start = time.process_time()
+        await async_send_updates(hass, simulator, monitor, updates)
+        cpu_time = time.process_time() - cpu_start
+        monitor.remove()
+
+        ## Action round-trip latency
+        call_latencies = []
+        for index in range(calls):
+            service = "volume_up" if index % 2 == 0 else "volume_down"
+            start = time.perf_counter()
+            await hass.services.async_call(
+                "media_player", service, {ATTR_ENTITY_ID: entity_id}, blocking=True
+            )
+            call_latencies.append(time.perf_counter() - start)
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return {
+        "zones": zones,
+        "entities": entities,
+        "enabled_entities": enabled_entities,
+        "setup_time_s": round(setup_time, 3),
+        "response_to_state_write_ms": summarise(latencies),
+        "state_writes_per_message": round(writes_per_message, 3),
+        "cpu_ms_per_1000_updates": round(cpu_time * 1000 * 1000 / updates, 3),
+        "action_round_trip_ms": summarise(call_latencies),
+        "avr_commands": simulator.stats["commands"],
+    }
+
+
+def get_metadata() -> dict[str, Any]:
+    """Return versions of the software being benchmarked."""
+    return {
+        "integration_version": VERSION,
+        "aiopioneer_version": metadata.version("aiopioneer"),
+        "homeassistant_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+async def main() -> int:
+    """Run benchmark scenarios and output results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--zones",
+        action="append",
+        help="comma separated zones for a scenario, may be repeated (default: 1)",
+    )
+    parser.add_argument(
+        "--entities",
+        default="default",
+        help="comma separated enabled entity modes: default, all or an entity count",
+    )
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+
+    results = []
+    for zones in args.zones or ["1"]:
+        for entities in args.entities.split(","):
+            _LOGGER.warning("running scenario: zones=%s, entities=%s", zones, entities)
+            results.append(
+                await async_run_scenario(
+                    zones.split(","), entities, args.samples, args.updates, args.calls
+                )
+            )
+
+    output = json.dumps({"metadata": get_metadata(), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
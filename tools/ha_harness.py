@@ -0,0 +1,99 @@
+"""Home Assistant test instance helpers for the Pioneer AVR development tools.
+
+Requires the pytest-homeassistant-custom-component package, which provides a
+Home Assistant test instance and mock config entries.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))  ## allow import of custom_components
+
+# pylint: disable=wrong-import-position
+from homeassistant import loader
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.pioneer_async.const import (
+    DOMAIN,
+    CONFIG_ENTRY_VERSION,
+    CONFIG_ENTRY_VERSION_MINOR,
+)
+
+from avr_simulator import AVRSimulator
+
+
+@asynccontextmanager
+async def async_test_instance() -> AsyncIterator[HomeAssistant]:
+    """Start a Home Assistant test instance that loads custom integrations."""
+    async with async_test_home_assistant() as hass:
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+        yield hass
+        await hass.async_block_till_done()
+
+
+def add_pioneer_entry(
+    hass: HomeAssistant,
+    simulator: AVRSimulator,
+    options: dict[str, Any] | None = None,
+    title: str = "Pioneer AVR",
+    minor_version: int = CONFIG_ENTRY_VERSION_MINOR,
+) -> MockConfigEntry:
+    """Add a Pioneer AVR config entry connecting to the AVR simulator.
+
+    Specify an earlier minor_version to have the config entry migrated when
+    it is set up.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=title,
+        data={CONF_HOST: simulator.host, CONF_PORT: simulator.port},
+        options=options or {},
+        version=CONFIG_ENTRY_VERSION,
+        minor_version=minor_version,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+def get_zone_entity_id(
+    hass: HomeAssistant, entry: MockConfigEntry, zone: str = "1"
+) -> str | None:
+    """Return the entity ID of the media player for a zone."""
+    return er.async_get(hass).async_get_entity_id(
+        "media_player", DOMAIN, f"{entry.entry_id}-{zone}"
+    )
+
+
+async def async_enable_all_entities(
+    hass: HomeAssistant, entry: MockConfigEntry, limit: int | None = None
+) -> int:
+    """Enable entities disabled by default and reload the config entry.
+
+    If limit is specified, enable only enough entities to reach that number
+    of enabled entities. Returns the number of enabled entities.
+    """
+    registry = er.async_get(hass)
+    entries = er.async_entries_for_config_entry(registry, entry.entry_id)
+    enabled = sum(1 for e in entries if not e.disabled)
+    for entity_entry in entries:
+        if limit is not None and enabled >= limit:
+            break
+        if entity_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+            registry.async_update_entity(entity_entry.entity_id, disabled_by=None)
+            enabled += 1
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    return enabled
@@ -0,0 +1,188 @@
+"""Microbenchmarks for Pioneer AVR entity property getters.
+
+Sets up the integration with all entities enabled in a Home Assistant test
+instance against the AVR simulator, then times the property getters that are
+evaluated on every state write. Results are compared against a stored
+baseline, and the script exits with an error if any getter is slower than
+the baseline by more than the tolerance.
+
+usage: python tools/microbench.py [--baseline FILE] [--save-baseline] [--tolerance 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from operator import attrgetter
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from avr_simulator import AVRSimulator
+from ha_harness import (
+    async_test_instance,
+    add_pioneer_entry,
+    async_enable_all_entities,
+)
+
+from custom_components.pioneer_async.const import DOMAIN
+from custom_components.pioneer_async.entity_base import PioneerEntityBase
+from custom_components.pioneer_async.media_player import PioneerZone
+from custom_components.pioneer_async.select import PioneerSelect
+from custom_components.pioneer_async.sensor import PioneerGenericSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "microbench_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_ITERATIONS = 2000
+
+GETTERS: dict[type[Entity], list[str]] = {  ## entity class: getters to time
+    PioneerZone: [
+        "supported_features",
+        "extra_state_attributes",
+        "state",
+        "volume_level",
+        "source_list",
+    ],
+    PioneerGenericSensor: ["extra_state_attributes", "native_value"],
+    PioneerSelect: ["options", "current_option"],
+    PioneerEntityBase: ["available", "unique_id"],
+}
+
+
+def calibrate(iterations: int) -> float:
+    """Return nanoseconds per call of a reference workload.
+
+    Results are normalised against the reference workload so that baselines
+    recorded on a different machine remain comparable.
+    """
+    data = {str(i): i for i in range(20)}
+
+    def reference() -> int:
+        return sum(v for k, v in data.items() if k != "0")
+
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        reference()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def time_getter(entities: list[Entity], getter: str, iterations: int) -> float:
+    """Return mean nanoseconds per call of a getter across entities."""
+    get = attrgetter(getter)
+    for entity in entities:
+        get(entity)  ## warm up
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        for entity in entities:
+            get(entity)
+    return (time.perf_counter_ns() - start) / (iterations * len(entities))
+
+
+def get_entities(hass: HomeAssistant) -> list[Entity]:
+    """Return all Pioneer AVR entity objects."""
+    entities = []
+    for platform in async_get_platforms(hass, DOMAIN):
+        entities.extend(platform.entities.values())
+    return entities
+
+
+async def async_run_benchmarks(zones: list[str], iterations: int) -> dict[str, Any]:
+    """Set up the integration and time entity getters."""
+    async with AVRSimulator(zones=zones) as simulator, async_test_instance() as hass:
+        for zone in zones:  ## populate zone properties
+            simulator.handle_command(
+                {"1": "PO", "2": "APO", "3": "BPO"}.get(zone, "ZEO")
+            )
+        simulator.state.display = "VOLUME -40.0dB"
+        entry = add_pioneer_entry(hass, simulator)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        await async_enable_all_entities(hass, entry)
+        entities = get_entities(hass)
+
+        calibration_ns = calibrate(iterations * 10)
+        results = {}
+        for entity_class, getters in GETTERS.items():
+            class_entities = [e for e in entities if isinstance(e, entity_class)]
+            if not class_entities:
+                _LOGGER.warning("no %s entities found", entity_class.__name__)
+                continue
+            for getter in getters:
+                ns_per_call = time_getter(class_entities, getter, iterations)
+                results[f"{entity_class.__name__}.{getter}"] = {
+                    "entities": len(class_entities),
+                    "ns_per_call": round(ns_per_call, 1),
+                    "normalised": round(ns_per_call / calibration_ns, 4),
+                }
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return {"calibration_ns": round(calibration_ns, 1), "results": results}
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return getters that are slower than the baseline beyond the tolerance."""
+    regressions = []
+    for name, result in results["results"].items():
+        if (baseline_result := baseline["results"].get(name)) is None:
+            continue
+        ratio = result["normalised"] / baseline_result["normalised"]
+        result["baseline_ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+async def main() -> int:
+    """Run microbenchmarks and compare against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--zones", default="1,2", help="comma separated zones")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="save results as baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed slowdown relative to baseline (default: 0.25 = 25%%)",
+    )
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+
+    results = await async_run_benchmarks(args.zones.split(","), args.iterations)
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", "utf-8")
+        print(json.dumps(results, indent=2))
+        return 0
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text("utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+    else:
+        _LOGGER.warning("baseline %s not found, skipping comparison", args.baseline)
+    results["regressions"] = regressions
+    print(json.dumps(results, indent=2))
+    if regressions:
+        _LOGGER.error("getters slower than baseline: %s", ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,112 @@
+"""Replay captured Pioneer AVR traffic through the AVR simulator.
+
+Captures are recorded by enabling the "Capture AVR traffic to file" debug
+option of the integration. Responses received from the AVR are sent by the
+simulator to connected clients at the captured times, optionally accelerated,
+while commands from clients are answered by the simulator as usual.
+
+usage: python tools/replay.py CAPTURE [--speed 10] [--port 8102] [--zones 1,2]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from avr_simulator import AVRSimulator, get_argument_parser, get_simulator
+
+## Load the capture format module directly, as importing the integration
+## package requires Home Assistant
+_spec = importlib.util.spec_from_file_location(
+    "capture_format",
+    Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "pioneer_async"
+    / "capture_format.py",
+)
+capture_format = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(capture_format)
+CaptureMessage = capture_format.CaptureMessage
+CAPTURE_RECEIVED = capture_format.CAPTURE_RECEIVED
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_capture(path: str) -> list[CaptureMessage]:
+    """Load messages from a capture file."""
+    messages = []
+    with open(path, encoding="utf-8") as capture_file:
+        for line in capture_file:
+            if (message := capture_format.parse_capture_line(line)) is not None:
+                messages.append(message)
+    return messages
+
+
+async def async_replay(
+    simulator: AVRSimulator, messages: list[CaptureMessage], speed: float = 1.0
+) -> dict[str, float]:
+    """Send captured AVR responses to simulator clients.
+
+    Responses are sent at the captured times divided by speed, or as fast as
+    possible if speed is 0.
+    """
+    responses = [m for m in messages if m.direction == CAPTURE_RECEIVED]
+    start = time.monotonic()
+    first = responses[0].elapsed if responses else 0
+    max_lag = 0.0
+    for response in responses:
+        if speed:
+            due = start + (response.elapsed - first) / speed
+            if (delay := due - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            max_lag = max(max_lag, time.monotonic() - due)
+        simulator.send_response(response.message)
+        if not speed:
+            await asyncio.sleep(0)  ## yield to simulator clients
+    return {
+        "responses": len(responses),
+        "duration_s": round(time.monotonic() - start, 3),
+        "max_lag_s": round(max_lag, 3),
+    }
+
+
+async def main() -> int:
+    """Replay a capture file to the first client that connects."""
+    parser = get_argument_parser()
+    parser.description = __doc__.split("\n\n")[0]
+    parser.set_defaults(keepalive=0)
+    parser.add_argument("capture", help="capture file to replay")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed multiplier, 0 to replay as fast as possible",
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    messages = load_capture(args.capture)
+    simulator = get_simulator(args)
+    await simulator.start()
+    try:
+        _LOGGER.info("waiting for client to connect")
+        await simulator.wait_for_client()
+        for _ in range(args.repeat):
+            result = await async_replay(simulator, messages, speed=args.speed)
+            print(json.dumps(result))
+    finally:
+        await simulator.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        pass
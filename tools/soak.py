@@ -0,0 +1,164 @@
+"""Reload soak test for the Pioneer AVR integration.
+
+Reloads a config entry set up against the AVR simulator many times, tracking
+the number of live AVR API, coordinator and entity objects and traced memory
+after each batch of reloads. Fails if objects from previous setups are not
+released, or if traced memory is still growing over the second half of the
+run.
+
+usage: python tools/soak.py [--reloads 300] [--zones 1,2] [--max-growth 1024]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+from typing import Any
+
+from aiopioneer import PioneerAVR
+
+from avr_simulator import AVRSimulator
+from ha_harness import async_test_instance, add_pioneer_entry
+
+from custom_components.pioneer_async.coordinator import PioneerAVRZoneCoordinator
+from custom_components.pioneer_async.entity_base import PioneerEntityBase
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACKED_CLASSES = {
+    "pioneer_avr": PioneerAVR,
+    "coordinators": PioneerAVRZoneCoordinator,
+    "entities": PioneerEntityBase,
+}
+DEFAULT_RELOADS = 300
+DEFAULT_SAMPLE_INTERVAL = 10
+DEFAULT_MAX_GROWTH = 1024  ## bytes per reload
+
+
+def count_live_objects() -> dict[str, int]:
+    """Return number of live objects of each tracked class."""
+    gc.collect()
+    counts = dict.fromkeys(TRACKED_CLASSES, 0)
+    for obj in gc.get_objects():
+        for name, tracked_class in TRACKED_CLASSES.items():
+            if isinstance(obj, tracked_class):
+                counts[name] += 1
+    return counts
+
+
+def get_slope(points: list[tuple[int, int]]) -> float:
+    """Return least squares slope of (reload, bytes) points."""
+    count = len(points)
+    if count < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    cov_xy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov_xy / var_x if var_x else 0.0
+
+
+async def async_soak(
+    zones: list[str], reloads: int, sample_interval: int, max_growth: float
+) -> dict[str, Any]:
+    """Reload the config entry repeatedly and return soak results."""
+    failures = []
+    samples = []
+    async with AVRSimulator(zones=zones) as simulator, async_test_instance() as hass:
+        simulator.handle_command("PO")
+        entry = add_pioneer_entry(hass, simulator)
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError("config entry setup failed")
+        await hass.async_block_till_done()
+        expected = count_live_objects()
+
+        tracemalloc.start()
+        snapshot_start = None
+        for reload in range(1, reloads + 1):
+            if not await hass.config_entries.async_reload(entry.entry_id):
+                raise RuntimeError(f"config entry reload {reload} failed")
+            await hass.async_block_till_done()
+            if reload % sample_interval and reload != reloads:
+                continue
+            counts = count_live_objects()
+            traced, _ = tracemalloc.get_traced_memory()
+            samples.append({"reload": reload, "traced_bytes": traced} | counts)
+            _LOGGER.info("reload %d: %s, traced %d bytes", reload, counts, traced)
+            if snapshot_start is None and reload >= reloads // 2:
+                snapshot_start = tracemalloc.take_snapshot()
+
+        snapshot_end = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    ## Live objects should not accumulate across reloads
+    final = samples[-1]
+    for name in TRACKED_CLASSES:
+        if final[name] > expected[name]:
+            failures.append(
+                f"{final[name]} live {name} after {reloads} reloads, "
+                f"expected {expected[name]}"
+            )
+
+    ## Traced memory should plateau over the second half of the run
+    second_half = [
+        (s["reload"], s["traced_bytes"]) for s in samples if s["reload"] > reloads // 2
+    ]
+    growth = get_slope(second_half)
+    if growth > max_growth:
+        failures.append(
+            f"traced memory growing by {growth:.0f} bytes per reload "
+            f"(maximum {max_growth:.0f})"
+        )
+
+    top_growth = []
+    if snapshot_start is not None:
+        for stat in snapshot_end.compare_to(snapshot_start, "lineno")[:10]:
+            top_growth.append(str(stat))
+
+    return {
+        "zones": zones,
+        "reloads": reloads,
+        "expected_objects": expected,
+        "growth_bytes_per_reload": round(growth, 1),
+        "samples": samples,
+        "top_growth": top_growth,
+        "failures": failures,
+    }
+
+
+async def main() -> int:
+    """Run the soak test and report results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--zones", default="1,2", help="comma separated zones")
+    parser.add_argument("--reloads", type=int, default=DEFAULT_RELOADS)
+    parser.add_argument("--sample-interval", type=int, default=DEFAULT_SAMPLE_INTERVAL)
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=DEFAULT_MAX_GROWTH,
+        help="maximum traced memory growth in bytes per reload",
+    )
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    logging.getLogger("aiopioneer").setLevel(logging.WARNING)
+    logging.getLogger("custom_components").setLevel(logging.WARNING)
+
+    result = await async_soak(
+        args.zones.split(","), args.reloads, args.sample_interval, args.max_growth
+    )
+    print(json.dumps(result, indent=2))
+    for failure in result["failures"]:
+        _LOGGER.error(failure)
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
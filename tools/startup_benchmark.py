@@ -0,0 +1,146 @@
+"""Startup time benchmark for the Pioneer AVR integration.
+
+Sets up the integration with config entries for several receivers, each
+connecting to its own AVR simulator, in the same way as Home Assistant does at
+startup, and reports the time spent in each phase of async_setup_entry as a
+flame-style breakdown. Phase timings are recorded by the integration itself
+(see timing.py), and are also logged at debug level during normal use.
+
+usage: python tools/startup_benchmark.py [--receivers 3] [--runs 5] [--folded FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from contextlib import AsyncExitStack
+from typing import Any
+
+from homeassistant.setup import async_setup_component
+
+from avr_simulator import AVRSimulator
+from ha_harness import async_test_instance, add_pioneer_entry
+
+from custom_components.pioneer_async.const import DOMAIN, CONFIG_ENTRY_VERSION_MINOR
+from custom_components.pioneer_async.timing import PioneerSetupTimer
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_run_startup(
+    receivers: int, zones: list[str], latency: float, migrate: bool
+) -> dict[str, Any]:
+    """Set up config entries for all receivers and return phase timings."""
+    async with AsyncExitStack() as stack:
+        simulators = []
+        for _ in range(receivers):
+            simulator = await stack.enter_async_context(
+                AVRSimulator(zones=zones, latency=latency)
+            )
+            simulator.handle_command("PO")  ## Zone 1 on so that entities are available
+            simulators.append(simulator)
+        hass = await stack.enter_async_context(async_test_instance())
+        minor_version = CONFIG_ENTRY_VERSION_MINOR - int(migrate)
+        entries = [
+            add_pioneer_entry(
+                hass,
+                simulator,
+                title=f"Pioneer AVR {index}",
+                minor_version=minor_version,
+            )
+            for index, simulator in enumerate(simulators, start=1)
+        ]
+
+        ## Config entries are set up concurrently, as at Home Assistant startup
+        start = time.perf_counter()
+        if not await async_setup_component(hass, DOMAIN, {}):
+            raise RuntimeError("integration setup failed")
+        await hass.async_block_till_done()
+        total_time = time.perf_counter() - start
+
+        timers = {}
+        for entry in entries:
+            if (pioneer_data := hass.data[DOMAIN].get(entry.entry_id)) is None:
+                raise RuntimeError(f"config entry {entry.title} not set up")
+            timers[entry.title] = pioneer_data.setup_timer
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return {"total_time": total_time, "timers": timers}
+
+
+def merge_timers(timers: list[PioneerSetupTimer]) -> PioneerSetupTimer:
+    """Return a timer with the median duration of each phase across timers."""
+    merged = PioneerSetupTimer()
+    for timer in timers:
+        for path in timer.walk():
+            merged.phases.setdefault(path, 0.0)
+    for path in merged.phases:
+        merged.phases[path] = statistics.median(t.phases.get(path, 0.0) for t in timers)
+    return merged
+
+
+async def main() -> int:
+    """Run the startup benchmark and output the phase breakdown."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--receivers", type=int, default=3)
+    parser.add_argument("--zones", default="1,2", help="comma separated zones")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="simulated AVR latency in seconds"
+    )
+    parser.add_argument(
+        "--migrate", action="store_true", help="migrate config entries during setup"
+    )
+    parser.add_argument("--folded", help="write folded stacks for flame graph tools")
+    parser.add_argument("--output", help="JSON output file")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+
+    total_times = []
+    receiver_timers: dict[str, list[PioneerSetupTimer]] = {}
+    for run in range(1, args.runs + 1):
+        _LOGGER.warning("run %d of %d", run, args.runs)
+        result = await async_run_startup(
+            args.receivers, args.zones.split(","), args.latency, args.migrate
+        )
+        total_times.append(result["total_time"])
+        for title, timer in result["timers"].items():
+            receiver_timers.setdefault(title, []).append(timer)
+
+    folded = []
+    phases = {}
+    for title, timers in receiver_timers.items():
+        merged = merge_timers(timers)
+        phases[title] = merged.as_dict()
+        print(f"{title} (median of {len(timers)} runs)")
+        print(merged.format_tree() + "\n")
+        folded += [f"{title.replace(' ', '_')};{line}" for line in merged.as_folded()]
+    print(f"integration setup: {statistics.median(total_times) * 1000:.1f}ms median")
+
+    if args.folded:
+        with open(args.folded, "w", encoding="utf-8") as folded_file:
+            folded_file.write("\n".join(folded) + "\n")
+    if args.output:
+        output = {
+            "receivers": args.receivers,
+            "zones": args.zones.split(","),
+            "runs": args.runs,
+            "integration_setup_ms": round(statistics.median(total_times) * 1000, 3),
+            "phases_ms": phases,
+        }
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(json.dumps(output, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))